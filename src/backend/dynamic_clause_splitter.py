@@ -1,13 +1,40 @@
+import os
 import re
 import json
+from concurrent.futures import ProcessPoolExecutor
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
+from bisect import bisect_left
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator
 from dataclasses import dataclass
 import logging
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; metadata falls back to the stdlib json encoder.
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:
+    # pyahocorasick is optional; keyword lookups fall back to one substring test per keyword.
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+def _dump_json(obj) -> bytes:
+    """Compact UTF-8 JSON encoding, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+def _configure_logging():
+    """Set up console logging when run as a script; importing the module leaves logging alone."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
 @dataclass
 class Clause:
     """Container for a single clause with metadata."""
@@ -22,22 +49,73 @@ class Clause:
 
 class DynamicClauseSplitter:
     """Dynamic clause splitter that extracts COMPLETE clauses from any document type."""
+
+    # UTF-8 quotes mis-decoded as cp1252 by OCR/PDF tools; longer sequences first
+    MOJIBAKE_FIXES = {
+        'â€œ': '"',
+        'â€™': "'",
+        'â€': '"',
+    }
     
     def __init__(self, processed_folder: str = "docs/processed", output_folder: str = "docs/clauses"):
         self.processed_folder = Path(processed_folder)
+        # Created on first save (save_clauses makes the per-document folder with parents)
         self.output_folder = Path(output_folder)
-        self.output_folder.mkdir(parents=True, exist_ok=True)
         
         # Load configuration
         self.config = self._load_config()
+
+        # Compile every pattern once; extraction runs them per document and per line
+        self._re = {
+            name: re.compile(pattern, re.MULTILINE | re.IGNORECASE)
+            for name, pattern in self.config["patterns"].items()
+        }
+        self._re.update({
+            "numbered": re.compile(
+                r'(?:^|\n)\s*(\d{1,2})\.\s*([A-Z][^:.\n]{0,80}?)[:.]?\s*([^\n].*?)(?=\n\s*\d{1,2}\.\s*[A-Z]|\n\s*SCHEDULE|\Z)',
+                re.MULTILINE | re.DOTALL,
+            ),
+            "numbered_alt_line": re.compile(r'^\s*(\d{1,2})\.\s*([A-Z][^:.\n]*?)[:.]?\s*(.*)'),
+            # Cheap one-pass census of candidate headers for each strategy. Only the
+            # header word or number is consumed, so adjacent headers are all counted.
+            "strategy_headers": re.compile(
+                r'(?P<numbered>\d{1,2}\.(?=\s*[A-Z]))|(?P<section>section(?=\s*\d))|(?P<article>article(?=\s*\d))',
+                re.IGNORECASE,
+            ),
+            "clause_start": re.compile(r'\n\s*(\d+)\.\s*[A-Z]'),
+            "schedule": re.compile(r'\n\s*SCHEDULE'),
+            "paragraph_split": re.compile(r'\n\s*\n'),
+            # Runs of 3+ line breaks (with blank space between) or of 2+ spaces
+            "clean_ws": re.compile(r'\n\s*\n\s*\n+| {2,}'),
+            "clean_mojibake": re.compile('|'.join(map(re.escape, self.MOJIBAKE_FIXES))),
+            "clean_num": re.compile(r'(\d+)\s*\.\s*([A-Z])'),
+        })
+
+        # Keyword lists as sets per category, so scoring a clause is a set intersection
+        self._keyword_sets = {
+            group: {name: frozenset(keywords) for name, keywords in self.config[group].items()}
+            for group in ("clause_keywords", "risk_indicators", "tag_keywords")
+        }
+
+        # Every keyword used by classification, risk and tagging, matched in a single scan
+        self._keywords = set()
+        for sets in self._keyword_sets.values():
+            for keywords in sets.values():
+                self._keywords.update(keywords)
+        self._automaton = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self._keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+
+        # Boilerplate clauses repeat across documents; remember recent scan results per instance
+        self._scan_keywords = lru_cache(maxsize=4096)(self._scan_keywords)
         
     def _load_config(self) -> Dict:
         """Load configuration for different document types."""
         return {
             "patterns": {
-                # Primary pattern for numbered clauses with full content
-                "numbered_full": r'(?:^|\n)\s*(\d{1,2})\.\s*([A-Z][A-Z\s&\-,()]+?)[:.]?\s*([\s\S]*?)(?=\n\s*\d{1,2}\.\s*[A-Z]|\n\s*SCHEDULE|\Z)',
-                
                 # Alternative for special formatting
                 "numbered_multiline": r'(\d{1,2})\.\s*([A-Z][^:.\n]+)[:.]?\s*((?:[^\n]|\n(?!\d{1,2}\.))*)',
                 
@@ -85,26 +163,58 @@ class DynamicClauseSplitter:
                 "low": [
                     "lessor shall", "owner responsible", "refundable", "with notice"
                 ]
+            },
+
+            # Common legal terms to tag
+            "tag_keywords": {
+                "payment": ["payment", "pay", "amount"],
+                "deadline": ["days", "months", "deadline", "within"],
+                "penalty": ["penalty", "fine", "forfeit"],
+                "notice": ["notice", "notify", "inform"],
+                "permission": ["consent", "permission", "approval"],
+                "restriction": ["shall not", "prohibited", "restricted"],
             }
         }
 
-    def extract_clauses(self, text: str, doc_name: str) -> List[Dict]:
-        """Extract complete clauses from document text."""
+    def _scan_keywords(self, title_lower: str, content_lower: str) -> Tuple[frozenset, frozenset]:
+        """Find configured keywords in "title content" and in the content alone, in one pass.
+
+        Returns (keywords in title + content, keywords in content).
+        """
+        text = title_lower + " " + content_lower
+        content_start = len(title_lower) + 1
+        if self._automaton is not None:
+            found_all, found_content = set(), set()
+            for end, keyword in self._automaton.iter(text):
+                found_all.add(keyword)
+                if end - len(keyword) + 1 >= content_start:
+                    found_content.add(keyword)
+            return frozenset(found_all), frozenset(found_content)
+        found_all = frozenset(keyword for keyword in self._keywords if keyword in text)
+        return found_all, frozenset(keyword for keyword in found_all if keyword in content_lower)
+
+    def extract_clauses(self, text: str, doc_name: str) -> Iterator[Dict]:
+        """Extract complete clauses from document text, yielding each as it is enriched."""
         # Clean text
         text = self._clean_text(text)
         
         # Try different extraction patterns
         clauses = []
+
+        # Each strategy yields at most one clause per header it can see, so one sweep
+        # counting headers tells which strategies could reach 3 clauses at all
+        header_counts = Counter(m.lastgroup for m in self._re["strategy_headers"].finditer(text))
         
         # Method 1: Try numbered pattern first (most common)
-        clauses = self._extract_numbered_clauses(text)
+        if header_counts["numbered"] >= 3:
+            clauses = self._extract_numbered_clauses(text)
         
         # Method 2: If not enough clauses, try section-based
-        if len(clauses) < 3:
+        if len(clauses) < 3 and header_counts["section"] >= 3:
             clauses = self._extract_section_clauses(text)
         
         # Method 3: If still not enough, try article-based
-        if len(clauses) < 3:
+        if len(clauses) < 3 and header_counts["article"] >= 3:
             clauses = self._extract_article_clauses(text)
         
         # Method 4: Last resort - paragraph-based splitting
@@ -112,27 +222,30 @@ class DynamicClauseSplitter:
             clauses = self._extract_paragraph_clauses(text)
         
         # Process and enrich clauses
-        processed_clauses = []
         for i, clause_data in enumerate(clauses):
             clause_num, title, content = clause_data
             
             # Create full clause object
-            clause_obj = self._create_clause_object(
+            yield self._create_clause_object(
                 clause_num, title, content, doc_name, i
             )
-            processed_clauses.append(clause_obj)
-        
-        return processed_clauses
 
     def _extract_numbered_clauses(self, text: str) -> List[Tuple[str, str, str]]:
         """Extract numbered clauses with COMPLETE content."""
         clauses = []
+
+        # Locate every clause start (by number) and SCHEDULE heading in one sweep each,
+        # so finding where a clause ends is a binary search instead of a rescan of the text
+        starts_by_number: Dict[int, List[int]] = {}
+        for start in self._re["clause_start"].finditer(text):
+            starts_by_number.setdefault(int(start.group(1)), []).append(start.start())
+        schedule_positions = []
+        if "SCHEDULE" in text:  # C-level literal search; most documents have no schedule
+            schedule_positions = [m.start() for m in self._re["schedule"].finditer(text)]
         
         # Split by numbered patterns
         # Pattern to match: "1. TITLE: content until next number or end"
-        pattern = r'(?:^|\n)\s*(\d{1,2})\.\s*([A-Z][^:.\n]*?)[:.]?\s*([^\n].*?)(?=\n\s*\d{1,2}\.\s*[A-Z]|\n\s*SCHEDULE|\Z)'
-        
-        matches = re.finditer(pattern, text, re.MULTILINE | re.DOTALL)
+        matches = self._re["numbered"].finditer(text)
         
         for match in matches:
             clause_num = match.group(1).strip()
@@ -141,19 +254,12 @@ class DynamicClauseSplitter:
             # Get the full content - from this clause to the start of next clause
             start_pos = match.start(3)
             
-            # Find the next clause number or end of document
-            next_pattern = rf'\n\s*{int(clause_num)+1}\.\s*[A-Z]'
-            next_match = re.search(next_pattern, text[start_pos:])
-            
-            if next_match:
-                end_pos = start_pos + next_match.start()
-            else:
-                # Check for SCHEDULE or end of document
-                schedule_match = re.search(r'\n\s*SCHEDULE', text[start_pos:])
-                if schedule_match:
-                    end_pos = start_pos + schedule_match.start()
-                else:
-                    end_pos = len(text)
+            # Find the next clause number, else SCHEDULE, else end of document
+            end_pos = self._first_at_or_after(starts_by_number.get(int(clause_num) + 1, ()), start_pos)
+            if end_pos is None:
+                end_pos = self._first_at_or_after(schedule_positions, start_pos)
+            if end_pos is None:
+                end_pos = len(text)
             
             content = text[start_pos:end_pos].strip()
             
@@ -166,24 +272,34 @@ class DynamicClauseSplitter:
         
         return clauses
 
+    @staticmethod
+    def _first_at_or_after(positions, pos: int) -> Optional[int]:
+        """First position in the sorted list that is >= pos, or None."""
+        i = bisect_left(positions, pos)
+        return positions[i] if i < len(positions) else None
+
     def _extract_numbered_alternative(self, text: str) -> List[Tuple[str, str, str]]:
         """Alternative method for numbered clauses - looks for complete content."""
         clauses = []
-        lines = text.split('\n')
+        numbered_line = self._re["numbered_alt_line"].match
         
         current_clause = None
         current_content = []
-        
-        for i, line in enumerate(lines):
+
+        def flush():
+            # Content lines are joined once, when the clause ends
+            if current_clause and current_content:
+                content = ' '.join(current_content).strip()
+                if len(content) > 20:
+                    clauses.append((current_clause[0], current_clause[1], content))
+        
+        for line in text.split('\n'):
             # Check if this line starts a new clause
-            clause_match = re.match(r'^\s*(\d{1,2})\.\s*([A-Z][^:.\n]*?)[:.]?\s*(.*)', line)
+            clause_match = numbered_line(line)
             
             if clause_match:
                 # Save previous clause if exists
-                if current_clause and current_content:
-                    content = ' '.join(current_content).strip()
-                    if len(content) > 20:
-                        clauses.append((current_clause[0], current_clause[1], content))
+                flush()
                 
                 # Start new clause
                 current_clause = (clause_match.group(1), clause_match.group(2).strip())
@@ -191,21 +307,17 @@ class DynamicClauseSplitter:
             elif current_clause:
                 # Add to current clause content
                 stripped_line = line.strip()
-                if stripped_line and not re.match(r'^SCHEDULE|^WITNESS|^IN WITNESS', stripped_line):
+                if stripped_line and not stripped_line.startswith(('SCHEDULE', 'WITNESS', 'IN WITNESS')):
                     current_content.append(stripped_line)
         
         # Don't forget the last clause
-        if current_clause and current_content:
-            content = ' '.join(current_content).strip()
-            if len(content) > 20:
-                clauses.append((current_clause[0], current_clause[1], content))
+        flush()
         
         return clauses
 
     def _extract_section_clauses(self, text: str) -> List[Tuple[str, str, str]]:
         """Extract section-based clauses."""
-        pattern = self.config["patterns"]["section_based"]
-        matches = re.finditer(pattern, text, re.MULTILINE | re.IGNORECASE)
+        matches = self._re["section_based"].finditer(text)
         
         clauses = []
         for match in matches:
@@ -220,8 +332,7 @@ class DynamicClauseSplitter:
 
     def _extract_article_clauses(self, text: str) -> List[Tuple[str, str, str]]:
         """Extract article-based clauses (common in ToS)."""
-        pattern = self.config["patterns"]["article_based"]
-        matches = re.finditer(pattern, text, re.MULTILINE | re.IGNORECASE)
+        matches = self._re["article_based"].finditer(text)
         
         clauses = []
         for match in matches:
@@ -237,7 +348,7 @@ class DynamicClauseSplitter:
     def _extract_paragraph_clauses(self, text: str) -> List[Tuple[str, str, str]]:
         """Fallback: Extract clauses based on paragraphs."""
         # Split by double newlines or clear paragraph breaks
-        paragraphs = re.split(r'\n\s*\n', text)
+        paragraphs = self._re["paragraph_split"].split(text)
         
         clauses = []
         clause_num = 1
@@ -246,7 +357,7 @@ class DynamicClauseSplitter:
             para = para.strip()
             if len(para) > 50:  # Meaningful paragraph
                 # Try to extract a title from first sentence
-                first_sentence = para.split('.')[0]
+                first_sentence = para.split('.', 1)[0]
                 if len(first_sentence) < 50:
                     title = first_sentence
                     content = para
@@ -262,31 +373,33 @@ class DynamicClauseSplitter:
     def _clean_text(self, text: str) -> str:
         """Clean text for better extraction."""
         # Remove excessive whitespace
-        text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
-        text = re.sub(r' +', ' ', text)
+        text = self._re["clean_ws"].sub(lambda m: ' ' if m.group()[0] == ' ' else '\n\n', text)
         
         # Fix common OCR issues
-        text = text.replace('â€œ', '"').replace('â€', '"')
-        text = text.replace('â€™', "'")
+        text = self._re["clean_mojibake"].sub(lambda m: self.MOJIBAKE_FIXES[m.group()], text)
         
         # Normalize numbering
-        text = re.sub(r'(\d+)\s*\.\s*([A-Z])', r'\1. \2', text)
+        text = self._re["clean_num"].sub(r'\1. \2', text)
         
         return text.strip()
 
     def _create_clause_object(self, clause_num: str, title: str, content: str, 
                              doc_name: str, index: int) -> Dict:
         """Create a complete clause object with all metadata."""
+        # One lowercase, one split and one keyword scan feed every derived field
+        words = content.split()
+        found_all, found_content = self._scan_keywords(title.lower(), content.lower())
+
         # Classify clause type
-        clause_type = self._classify_clause(title, content)
+        clause_type = self._classify_clause(found_all)
         
         # Assess risk level
-        risk_level = self._assess_risk(content)
+        risk_level = self._assess_risk(found_content)
         
         # Clean up title
         if not title or title == f"Clause {clause_num}":
             # Try to extract title from content
-            first_words = content.split()[:5]
+            first_words = words[:5]
             title = ' '.join(first_words) if first_words else f"Clause {clause_num}"
         
         return {
@@ -295,74 +408,60 @@ class DynamicClauseSplitter:
             "clause_title": title.upper() if len(title) < 50 else title,
             "clause_type": clause_type,
             "original_text": content,
-            "word_count": len(content.split()),
+            "word_count": len(words),
             "risk_level": risk_level,
-            "is_complete": len(content.split()) > 20,
-            "tags": self._extract_tags(content)
+            "is_complete": len(words) > 20,
+            "tags": self._extract_tags(found_content)
         }
 
-    def _classify_clause(self, title: str, content: str) -> str:
-        """Classify the clause type based on keywords."""
-        text = (title + " " + content).lower()
+    def _classify_clause(self, found: set) -> str:
+        """Classify the clause type from the keywords found in its title and content."""
         
         best_match = "general"
         best_score = 0
         
-        for clause_type, keywords in self.config["clause_keywords"].items():
-            score = sum(1 for keyword in keywords if keyword in text)
+        for clause_type, keywords in self._keyword_sets["clause_keywords"].items():
+            score = len(keywords & found)
             if score > best_score:
                 best_score = score
                 best_match = clause_type
         
         return best_match
 
-    def _assess_risk(self, content: str) -> str:
-        """Assess risk level of clause."""
-        content_lower = content.lower()
+    def _assess_risk(self, found: set) -> str:
+        """Assess risk level of clause from the keywords found in its content."""
         
+        indicators = self._keyword_sets["risk_indicators"]
+
         # Check for high risk indicators
-        high_risk_count = sum(1 for indicator in self.config["risk_indicators"]["high"] 
-                            if indicator in content_lower)
+        high_risk_count = len(indicators["high"] & found)
         if high_risk_count >= 2:
             return "high"
         
         # Check for medium risk
-        medium_risk_count = sum(1 for indicator in self.config["risk_indicators"]["medium"] 
-                              if indicator in content_lower)
+        medium_risk_count = len(indicators["medium"] & found)
         if medium_risk_count >= 2 or high_risk_count >= 1:
             return "medium"
         
         # Check for low risk
-        low_risk_count = sum(1 for indicator in self.config["risk_indicators"]["low"] 
-                           if indicator in content_lower)
+        low_risk_count = len(indicators["low"] & found)
         if low_risk_count >= 1:
             return "low"
         
         return "standard"
 
-    def _extract_tags(self, content: str) -> List[str]:
-        """Extract relevant tags from clause content."""
-        tags = []
-        content_lower = content.lower()
-        
-        # Common legal terms to tag
-        tag_keywords = {
-            "payment": ["payment", "pay", "amount"],
-            "deadline": ["days", "months", "deadline", "within"],
-            "penalty": ["penalty", "fine", "forfeit"],
-            "notice": ["notice", "notify", "inform"],
-            "permission": ["consent", "permission", "approval"],
-            "restriction": ["shall not", "prohibited", "restricted"],
-        }
-        
-        for tag, keywords in tag_keywords.items():
-            if any(keyword in content_lower for keyword in keywords):
-                tags.append(tag)
-        
-        return tags
+    def _extract_tags(self, found: set) -> List[str]:
+        """Extract relevant tags from the keywords found in clause content."""
+        return [
+            tag for tag, keywords in self._keyword_sets["tag_keywords"].items()
+            if not keywords.isdisjoint(found)
+        ]
 
-    def save_clauses(self, clauses: List[Dict], doc_name: str, doc_type: str = "unknown"):
-        """Save extracted clauses to files."""
+    def save_clauses(self, clauses: Iterable[Dict], doc_name: str, doc_type: str = "unknown"):
+        """Save extracted clauses to files as they stream in.
+
+        Returns the document metadata (counts and risk summary, without the clauses).
+        """
         doc_folder = self.output_folder / doc_name
         doc_folder.mkdir(parents=True, exist_ok=True)
         
@@ -370,39 +469,54 @@ class DynamicClauseSplitter:
         metadata = {
             "document_name": doc_name,
             "document_type": doc_type,
-            "total_clauses": len(clauses),
             "extraction_timestamp": str(Path().absolute()),
-            "risk_summary": {
-                "high": sum(1 for c in clauses if c["risk_level"] == "high"),
-                "medium": sum(1 for c in clauses if c["risk_level"] == "medium"),
-                "low": sum(1 for c in clauses if c["risk_level"] == "low"),
-                "standard": sum(1 for c in clauses if c["risk_level"] == "standard"),
-            },
-            "clauses": clauses
         }
+        risk_counts = Counter()
+        total_clauses = 0
         
-        # Save individual clause files
-        for clause in clauses:
-            clause_file = doc_folder / f"clause_{clause['clause_number']}_{clause['clause_type']}.txt"
-            with open(clause_file, 'w', encoding='utf-8') as f:
-                f.write(f"CLAUSE {clause['clause_number']}: {clause['clause_title']}\n")
-                f.write("=" * 60 + "\n")
-                f.write(f"Type: {clause['clause_type']}\n")
-                f.write(f"Risk Level: {clause['risk_level']}\n")
-                f.write(f"Word Count: {clause['word_count']}\n")
-                f.write("-" * 60 + "\n\n")
-                f.write(clause['original_text'])
-        
-        # Save metadata JSON
+        # Save individual clause files while streaming the metadata JSON. It is written to a temporary
+        # file and moved into place once complete, so a failure partway never leaves truncated JSON
         metadata_file = doc_folder / f"{doc_name}_clauses.json"
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2)
-        
-        logger.info(f"✓ Saved {len(clauses)} complete clauses for {doc_name}")
+        tmp_file = metadata_file.with_name(metadata_file.name + '.tmp')
+        try:
+            with open(tmp_file, 'wb') as meta:
+                # The JSON object is written by hand: header fields, each clause as it arrives, then the totals
+                meta.write(_dump_json(metadata)[:-1] + b',"clauses":[')
+                for clause in clauses:
+                    # Each file is assembled in memory and written with a single call
+                    clause_file = doc_folder / f"clause_{clause['clause_number']}_{clause['clause_type']}.txt"
+                    clause_file.write_text(''.join([
+                        f"CLAUSE {clause['clause_number']}: {clause['clause_title']}\n",
+                        "=" * 60 + "\n",
+                        f"Type: {clause['clause_type']}\n",
+                        f"Risk Level: {clause['risk_level']}\n",
+                        f"Word Count: {clause['word_count']}\n",
+                        "-" * 60 + "\n\n",
+                        clause['original_text'],
+                    ]), encoding='utf-8')
+
+                    if total_clauses:
+                        meta.write(b',')
+                    meta.write(_dump_json(clause))
+                    risk_counts[clause["risk_level"]] += 1
+                    total_clauses += 1
+
+                metadata["total_clauses"] = total_clauses
+                metadata["risk_summary"] = {
+                    level: risk_counts[level] for level in ("high", "medium", "low", "standard")
+                }
+                meta.write(b'],"total_clauses":' + _dump_json(total_clauses)
+                           + b',"risk_summary":' + _dump_json(metadata["risk_summary"]) + b'}')
+            tmp_file.replace(metadata_file)
+        except BaseException:
+            tmp_file.unlink(missing_ok=True)
+            raise
+        
+        logger.info(f"✓ Saved {total_clauses} complete clauses for {doc_name}")
         
         # Print summary
         print(f"\n📄 Document: {doc_name}")
-        print(f"   Total Clauses: {len(clauses)}")
+        print(f"   Total Clauses: {total_clauses}")
         print(f"   Risk Distribution:")
         print(f"     • High Risk: {metadata['risk_summary']['high']}")
         print(f"     • Medium Risk: {metadata['risk_summary']['medium']}")
@@ -431,21 +545,35 @@ class DynamicClauseSplitter:
         
         # Extract clauses
         clauses = self.extract_clauses(text, doc_name)
+        first_clause = next(clauses, None)
         
-        if not clauses:
+        if first_clause is None:
             logger.warning(f"No clauses found in {doc_name}")
             return None
         
         # Save clauses
-        return self.save_clauses(clauses, doc_name, doc_type)
+        return self.save_clauses(chain([first_clause], clauses), doc_name, doc_type)
+
+# One splitter per worker process, built by the pool initializer
+_worker_splitter: Optional[DynamicClauseSplitter] = None
+
+def _init_worker():
+    """Build the worker's splitter (compiled patterns and keyword automaton) once."""
+    global _worker_splitter
+    _configure_logging()
+    _worker_splitter = DynamicClauseSplitter()
+
+def _process_one(text_file: Path):
+    """Split one document in a worker process."""
+    _worker_splitter.process_document(text_file)
 
 def main():
     """Main execution."""
-    splitter = DynamicClauseSplitter()
-    
+    _configure_logging()
+
     # Process all documents in processed folder
     processed_folder = Path("docs/processed")
-    text_files = list(processed_folder.glob("*.txt"))
+    text_files = [f for f in processed_folder.glob("*.txt") if "_metadata" not in f.name]
     
     if not text_files:
         print("No text files found in docs/processed")
@@ -453,9 +581,12 @@ def main():
     
     print(f"Found {len(text_files)} documents to process\n")
     
-    for text_file in text_files:
-        if "_metadata" not in text_file.name:
-            splitter.process_document(text_file)
+    # Documents are independent and CPU-bound, so split them across cores
+    if len(text_files) == 1:
+        DynamicClauseSplitter().process_document(text_files[0])
+        return
+    with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(text_files)), initializer=_init_worker) as pool:
+        list(pool.map(_process_one, text_files, chunksize=4))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
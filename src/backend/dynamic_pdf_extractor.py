@@ -1,20 +1,70 @@
-import pdfplumber
-import fitz  # PyMuPDF
-import pytesseract
-from PIL import Image
+import fitz  # PyMuPDF; pdfplumber, pytesseract and PIL are imported where first used
 from pathlib import Path
 import re
 import os
 import json
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+import hashlib
+import shutil
+from typing import Dict, List, Tuple, Optional, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
 import logging
 from datetime import datetime
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; metadata and reports fall back to the stdlib json encoder.
+    orjson = None
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def _configure_logging():
+    """Set up console logging for script runs; importing the module leaves the host's logging alone."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def _limit_tesseract_threads():
+    """Keep libtesseract single-threaded; pages and files are already parallelized.
+
+    OpenMP reads the limit when libtesseract loads, so this runs before tesserocr is first imported.
+    """
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+def _dump_json(obj, indent: bool = False) -> bytes:
+    """UTF-8 JSON encoding, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+# OCR render zoom (1.0 = 72 DPI); 2x is the ceiling, scans below that are rendered at their native DPI
+OCR_MAX_ZOOM = 2.0
+
+# Lines made up only of these characters are scanning noise
+NOISE_LINE_CHARS = ';:i!.'
+
+# Short lines worth keeping even though they are under three characters
+KEEP_SHORT_WORDS = frozenset({'AND', 'OR', 'WHEREAS', 'NOW', 'THEREFORE', 'HEREBY'})
+
+# Universal cleaning patterns, applied in order after the document-specific ones.
+# The stamp/certificate preambles share one terminator, so they are matched as one pattern.
+UNIVERSAL_CLEANING_PATTERNS = [
+    # Remove stamp/certificate information
+    r'(?:INDIA NON JUDICIAL|Government of Karnataka|e-stamp|Certificate No\.)'
+    r'.*?(?=RENTAL AGREEMENT|LOAN AGREEMENT|THIS AGREEMENT)',
+    # Remove witness blocks
+    r'IN WITNESS WHEREOF.*?(?:Page\s*\d+\s*of\s*\d+|$)',
+    r'WITNESSES?:.*?(?:Signature|$)',
+    # Remove page references
+    r'Page\s*\d+\s*of\s*\d+',
+    # Remove signature lines
+    r'^\s*[-_]{3,}\s*$'
+]
+
 @dataclass
 class ExtractionResult:
     """Container for extraction results with metadata."""
@@ -28,6 +78,18 @@ class ExtractionResult:
 
 class DynamicPDFExtractor:
     """Dynamic PDF text extraction with adaptive methods and cleaning."""
+
+    # Idle tesserocr APIs, shared across documents; each is used by one thread at a time
+    _tess_apis: "queue.SimpleQueue" = queue.SimpleQueue()
+    # tesserocr (in-process Tesseract API, no subprocess per page) is imported on first OCR use
+    _tesserocr_ok = True
+    # OCR threads live for the whole run, so their tesserocr APIs stay loaded between documents
+    _ocr_pool: Optional[ThreadPoolExecutor] = None
+    # Tesseract binary for the pytesseract fallback, applied when that module is first imported
+    _tesseract_cmd: Optional[str] = None
+    # Resolved Tesseract binary per configured path, so repeat construction skips the filesystem probes
+    _tesseract_lookup: Dict[Optional[str], Optional[str]] = {}
+    ocr_threads = os.cpu_count() or 1
     
     def __init__(self, input_folder: str = "docs", output_folder: str = "docs/processed"):
         self.input_folder = Path(input_folder)
@@ -36,6 +98,12 @@ class DynamicPDFExtractor:
         
         # Dynamic configuration
         self.config = self._load_config()
+        self._re = self._compile_patterns()
+        self._patterns_upper = self._uppercase_patterns()
+        # Cached extractions are only valid for the config that produced them
+        self._config_hash = hashlib.blake2b(json.dumps(self.config, sort_keys=True).encode('utf-8'),
+                                            digest_size=16).hexdigest()
+        self.cache_folder = self.output_folder / ".cache"
         self._setup_tesseract()
         
         # Statistics tracking
@@ -141,23 +209,111 @@ class DynamicPDFExtractor:
         
         return default_config
 
+    def _compile_patterns(self) -> Dict:
+        """Compile the cleaning and line-classification regexes once per extractor."""
+        fixes = sorted(self.config['encoding_fixes'], key=len, reverse=True)
+        return {
+            # Longest key first, so e.g. 'â€™' wins over its prefix 'â€'
+            'encoding_fixes': re.compile('|'.join(map(re.escape, fixes)) if fixes else r'(?!)'),
+            'per_type': {
+                doc_type: [re.compile(p, re.DOTALL | re.IGNORECASE) for p in cfg['cleaning_patterns']]
+                for doc_type, cfg in self.config['document_patterns'].items()
+            },
+            'universal': [re.compile(p, re.DOTALL | re.IGNORECASE | re.MULTILINE)
+                          for p in UNIVERSAL_CLEANING_PATTERNS],
+            'ws_newlines': re.compile(r'\n{3,}'),
+            'ws_spaces': re.compile(r'[ \t]+'),
+            'stray_prefix': re.compile(r'^[;:i]\s+', re.MULTILINE),
+            'keep_line': re.compile(r'^\d+[\.)]\s*$|^(?:ARTICLE|SCHEDULE|ANNEXURE|CLAUSE|SECTION)|^\d+[\.)]\s+'),
+            'numbered_clause': re.compile(r'\n\d+\.\s+[A-Z]'),
+            'numbered_line': re.compile(r'\n\d+\.\s+'),
+        }
+
+    def _uppercase_patterns(self) -> Dict:
+        """Normalise the detection keywords once instead of per call."""
+        return {
+            doc_type: {
+                'filename_keywords': cfg['filename_keywords'],
+                'content_patterns': [p.upper() for p in cfg['content_patterns']],
+                'structure_indicators': [i.upper() for i in cfg['structure_indicators']],
+            }
+            for doc_type, cfg in self.config['document_patterns'].items()
+        }
+
     def _setup_tesseract(self):
         """Dynamically setup Tesseract path."""
+        configured = self.config.get('tesseract_path')
+        if configured in DynamicPDFExtractor._tesseract_lookup:
+            DynamicPDFExtractor._tesseract_cmd = DynamicPDFExtractor._tesseract_lookup[configured]
+            return
+        
         tesseract_paths = [
-            self.config.get('tesseract_path'),
+            configured,
+            shutil.which('tesseract'),
             r'C:\Program Files\Tesseract-OCR\tesseract.exe',
             r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
             '/usr/bin/tesseract',
             '/usr/local/bin/tesseract'
         ]
         
-        for path in tesseract_paths:
-            if path and Path(path).exists():
-                pytesseract.pytesseract.tesseract_cmd = path
-                logger.info(f"Using Tesseract at: {path}")
-                return
-        
-        logger.warning("Tesseract not found. OCR extraction will be disabled.")
+        found = next((path for path in tesseract_paths if path and Path(path).exists()), None)
+        DynamicPDFExtractor._tesseract_lookup[configured] = found
+        DynamicPDFExtractor._tesseract_cmd = found
+        if found:
+            logger.info(f"Using Tesseract at: {found}")
+        else:
+            logger.warning("Tesseract not found. OCR extraction will be disabled.")
+
+    @classmethod
+    def _get_ocr_pool(cls) -> ThreadPoolExecutor:
+        """Create the shared OCR thread pool on first use."""
+        if cls._ocr_pool is None:
+            cls._ocr_pool = ThreadPoolExecutor(max_workers=cls.ocr_threads, thread_name_prefix="ocr")
+        return cls._ocr_pool
+
+    @classmethod
+    def shutdown_ocr_pool(cls):
+        """Stop the OCR threads and release the loaded tesserocr APIs."""
+        if cls._ocr_pool is not None:
+            cls._ocr_pool.shutdown()
+            cls._ocr_pool = None
+        while True:
+            try:
+                cls._tess_apis.get_nowait().End()
+            except queue.Empty:
+                break
+
+    @classmethod
+    def _ocr_pixmap(cls, pix) -> str:
+        """OCR one rendered page, reusing a loaded tesserocr API when available."""
+        if cls._tesserocr_ok:
+            try:
+                api = cls._tess_apis.get_nowait()
+            except queue.Empty:
+                try:
+                    import tesserocr
+                    api = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.SINGLE_BLOCK,
+                                                  oem=tesserocr.OEM.LSTM_ONLY)
+                except ImportError:  # Fall back to the pytesseract subprocess wrapper
+                    cls._tesserocr_ok = False
+                    api = None
+                except RuntimeError as e:
+                    logger.warning(f"tesserocr unavailable ({e}); falling back to pytesseract")
+                    cls._tesserocr_ok = False
+                    api = None
+            if api is not None:
+                try:
+                    # Hand the raw pixmap buffer over directly, no PIL image in between
+                    api.SetImageBytes(pix.samples, pix.width, pix.height, pix.n, pix.stride)
+                    return api.GetUTF8Text()
+                finally:
+                    cls._tess_apis.put(api)
+        import pytesseract
+        from PIL import Image
+        if cls._tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = cls._tesseract_cmd
+        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+        return pytesseract.image_to_string(img, config='--psm 6')
 
     def detect_document_type(self, text: str, filename: str) -> str:
         """Dynamically detect document type using configuration."""
@@ -167,7 +323,7 @@ class DynamicPDFExtractor:
         # Score-based detection for better accuracy
         type_scores = {}
         
-        for doc_type, patterns in self.config['document_patterns'].items():
+        for doc_type, patterns in self._patterns_upper.items():
             score = 0
             
             # Check filename keywords
@@ -177,12 +333,12 @@ class DynamicPDFExtractor:
             
             # Check content patterns
             for pattern in patterns['content_patterns']:
-                if pattern.upper() in text_upper:
+                if pattern in text_upper:
                     score += 15
             
             # Check structure indicators
             for indicator in patterns['structure_indicators']:
-                score += text_upper.count(indicator.upper()) * 2
+                score += text_upper.count(indicator) * 2
             
             type_scores[doc_type] = score
         
@@ -195,67 +351,50 @@ class DynamicPDFExtractor:
         if not text:
             return ""
         
-        # Apply encoding fixes
-        for bad, good in self.config['encoding_fixes'].items():
-            text = text.replace(bad, good)
+        # Apply encoding fixes in a single pass
+        fixes = self.config['encoding_fixes']
+        text = self._re['encoding_fixes'].sub(lambda m: fixes[m.group()], text)
         
         # Apply document-specific cleaning patterns
-        if doc_type in self.config['document_patterns']:
-            patterns = self.config['document_patterns'][doc_type]['cleaning_patterns']
-            for pattern in patterns:
-                text = re.sub(pattern, '', text, flags=re.DOTALL | re.IGNORECASE)
+        for pattern in self._re['per_type'].get(doc_type, ()):
+            text = pattern.sub('', text)
         
         # Universal cleaning patterns
-        universal_patterns = [
-            # Remove stamp/certificate information
-            r'INDIA NON JUDICIAL.*?(?=RENTAL AGREEMENT|LOAN AGREEMENT|THIS AGREEMENT)',
-            r'Government of Karnataka.*?(?=RENTAL AGREEMENT|LOAN AGREEMENT|THIS AGREEMENT)',
-            r'e-stamp.*?(?=RENTAL AGREEMENT|LOAN AGREEMENT|THIS AGREEMENT)',
-            r'Certificate No\..*?(?=RENTAL AGREEMENT|LOAN AGREEMENT|THIS AGREEMENT)',
-            # Remove witness blocks
-            r'IN WITNESS WHEREOF.*?(?:Page\s*\d+\s*of\s*\d+|$)',
-            r'WITNESSES?:.*?(?:Signature|$)',
-            # Remove page references
-            r'Page\s*\d+\s*of\s*\d+',
-            # Remove signature lines
-            r'^\s*[-_]{3,}\s*$'
-        ]
-        
-        for pattern in universal_patterns:
-            text = re.sub(pattern, '', text, flags=re.DOTALL | re.IGNORECASE | re.MULTILINE)
+        for pattern in self._re['universal']:
+            text = pattern.sub('', text)
         
         # Clean up whitespace and random characters
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        text = re.sub(r'[ \t]+', ' ', text)
+        text = self._re['ws_newlines'].sub('\n\n', text)
+        text = self._re['ws_spaces'].sub(' ', text)
         
         # Remove random single characters that appear at start of lines
-        text = re.sub(r'^[;:i]\s+', '', text, flags=re.MULTILINE)
+        text = self._re['stray_prefix'].sub('', text)
         
         # Process lines intelligently
-        lines = text.split('\n')
+        keep_line = self._re['keep_line'].match
         cleaned_lines = []
         
-        for line in lines:
+        for line in text.split('\n'):
             line = line.strip()
             
-            if not line:
+            # Skip empty lines and lines that are just random characters
+            if not line.strip(NOISE_LINE_CHARS):
                 continue
             
-            # Remove lines that are just random characters
-            if re.match(r'^[;:i!\.]+$', line):
-                continue
-            
-            # Keep important content
-            if (len(line) > 2 or 
-                re.match(r'^\d+[\.)]\s*$', line) or
-                line.upper() in ['AND', 'OR', 'WHEREAS', 'NOW', 'THEREFORE', 'HEREBY'] or
-                re.match(r'^(ARTICLE|SCHEDULE|ANNEXURE|CLAUSE|SECTION)', line.upper()) or
-                re.match(r'^\d+[\.)]\s+', line)):
+            # Keep important content; the regex only runs for the rare very short line
+            if (len(line) > 2 or
+                line.upper() in KEEP_SHORT_WORDS or
+                keep_line(line)):
                 cleaned_lines.append(line)
         
         return '\n'.join(cleaned_lines).strip()
 
-    def calculate_quality_score(self, text: str, doc_type: str) -> int:
+    def _count_encoding_issues(self, text: str) -> int:
+        """Count mis-encoded sequences in one scan over the text."""
+        return sum(1 for _ in self._re['encoding_fixes'].finditer(text))
+
+    def calculate_quality_score(self, text: str, doc_type: str,
+                                encoding_issues: Optional[int] = None) -> int:
         """Calculate text extraction quality score dynamically."""
         if not text:
             return 0
@@ -263,131 +402,219 @@ class DynamicPDFExtractor:
         base_score = len(text)
         
         # Deduct points for encoding issues
-        encoding_issues = sum(text.count(bad) for bad in self.config['encoding_fixes'].keys())
+        if encoding_issues is None:
+            encoding_issues = self._count_encoding_issues(text)
         base_score -= encoding_issues * 20
         base_score -= text.count('?') * 5
         
         # Add points for document structure
-        if doc_type in self.config['document_patterns']:
-            indicators = self.config['document_patterns'][doc_type]['structure_indicators']
-            for indicator in indicators:
-                base_score += text.upper().count(indicator.upper()) * 10
+        if doc_type in self._patterns_upper:
+            text_upper = text.upper()
+            for indicator in self._patterns_upper[doc_type]['structure_indicators']:
+                base_score += text_upper.count(indicator) * 10
         
         # Add points for proper clause numbering
-        base_score += len(re.findall(r'\n\d+\.\s+[A-Z]', text)) * 15
+        base_score += len(self._re['numbered_clause'].findall(text)) * 15
         
         return max(0, base_score)
 
-    def extract_text_pdfplumber(self, path: Path) -> ExtractionResult:
-        """Extract text using pdfplumber with improved settings."""
+    @staticmethod
+    def _pdfplumber_text(pdf, layout: bool) -> str:
+        """Join the text of every page, one newline after each."""
+        parts = []
+        for page in pdf.pages:
+            page_text = page.extract_text(x_tolerance=1, y_tolerance=1, layout=layout)
+            if page_text:
+                parts.append(page_text)
+                parts.append("\n")
+            # Drop the parsed page objects as we go, so big files don't hold every page in memory
+            page.close()
+        return "".join(parts)
+
+    def _build_result(self, text: str, filename: str, method: str) -> ExtractionResult:
+        """Detect, clean and score raw extracted text, scanning for encoding issues once."""
+        # Nothing extracted (typically a scan through a text extractor): skip the post-pipeline
+        if not text or text.isspace():
+            return ExtractionResult("", "unknown", method, 0, 0, 0, False)
+        
+        doc_type = self.detect_document_type(text, filename)
+        cleaned_text = self.clean_text_dynamic(text, doc_type)
+        encoding_issues = self._count_encoding_issues(cleaned_text)
+        
+        return ExtractionResult(
+            text=cleaned_text,
+            doc_type=doc_type,
+            method_used=method,
+            quality_score=self.calculate_quality_score(cleaned_text, doc_type, encoding_issues),
+            encoding_issues=encoding_issues,
+            word_count=len(cleaned_text.split()),
+            has_structure=bool(self._re['numbered_line'].search(cleaned_text))
+        )
+
+    def extract_text_pdfplumber(self, path: Path, doc=None) -> ExtractionResult:
+        """Extract text using pdfplumber with improved settings (``doc`` is unused)."""
         try:
-            text = ""
+            import pdfplumber
             with pdfplumber.open(path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text(
-                        x_tolerance=1,
-                        y_tolerance=1,
-                        layout=True
-                    )
-                    if page_text:
-                        text += page_text + "\n"
-            
-            doc_type = self.detect_document_type(text, path.name)
-            cleaned_text = self.clean_text_dynamic(text, doc_type)
-            quality_score = self.calculate_quality_score(cleaned_text, doc_type)
+                # Plain extraction first; the slower layout mode only if no clause numbering survived
+                text = self._pdfplumber_text(pdf, layout=False)
+                if not self._re['numbered_line'].search(text):
+                    text = self._pdfplumber_text(pdf, layout=True)
             
-            return ExtractionResult(
-                text=cleaned_text,
-                doc_type=doc_type,
-                method_used="PDFPlumber",
-                quality_score=quality_score,
-                encoding_issues=sum(cleaned_text.count(bad) for bad in self.config['encoding_fixes'].keys()),
-                word_count=len(cleaned_text.split()),
-                has_structure=bool(re.search(r'\n\d+\.\s+', cleaned_text))
-            )
+            return self._build_result(text, path.name, "PDFPlumber")
             
         except Exception as e:
             logger.error(f"PDFPlumber failed for {path.name}: {e}")
             return ExtractionResult("", "unknown", "PDFPlumber", 0, 0, 0, False)
 
-    def extract_text_pymupdf(self, path: Path) -> ExtractionResult:
-        """Extract text using PyMuPDF."""
+    def extract_text_pymupdf(self, path: Path, doc=None) -> ExtractionResult:
+        """Extract text using PyMuPDF, reusing ``doc`` if it is already open."""
         try:
-            text = ""
-            doc = fitz.open(path)
-            for page in doc:
-                page_text = page.get_text("text", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-                if page_text:
-                    text += page_text + "\n"
-            doc.close()
-            
-            doc_type = self.detect_document_type(text, path.name)
-            cleaned_text = self.clean_text_dynamic(text, doc_type)
-            quality_score = self.calculate_quality_score(cleaned_text, doc_type)
+            parts = []
+            with _fitz_document(path, doc) as doc:
+                for page in doc:
+                    page_text = page.get_text("text", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+                    if page_text:
+                        parts.append(page_text)
+                        parts.append("\n")
+            text = "".join(parts)
             
-            return ExtractionResult(
-                text=cleaned_text,
-                doc_type=doc_type,
-                method_used="PyMuPDF",
-                quality_score=quality_score,
-                encoding_issues=sum(cleaned_text.count(bad) for bad in self.config['encoding_fixes'].keys()),
-                word_count=len(cleaned_text.split()),
-                has_structure=bool(re.search(r'\n\d+\.\s+', cleaned_text))
-            )
+            return self._build_result(text, path.name, "PyMuPDF")
             
         except Exception as e:
             logger.error(f"PyMuPDF failed for {path.name}: {e}")
             return ExtractionResult("", "unknown", "PyMuPDF", 0, 0, 0, False)
 
-    def extract_text_ocr(self, path: Path) -> ExtractionResult:
-        """Extract text using OCR for scanned documents."""
+    @staticmethod
+    def _ocr_zoom(page) -> float:
+        """Render zoom for OCR, never sampling above the page's scanned resolution."""
+        images = [info for info in page.get_image_info() if info['bbox'][2] > info['bbox'][0]]
+        if not images:
+            return OCR_MAX_ZOOM
+        # The largest image on a scanned page is the scan itself
+        scan = max(images, key=lambda info: (info['bbox'][2] - info['bbox'][0]) * (info['bbox'][3] - info['bbox'][1]))
+        native_zoom = scan['width'] / (scan['bbox'][2] - scan['bbox'][0])
+        return max(1.0, min(OCR_MAX_ZOOM, native_zoom))
+
+    def extract_text_ocr(self, path: Path, doc=None) -> ExtractionResult:
+        """Extract text using OCR for scanned documents, reusing ``doc`` if it is already open."""
         try:
-            text = ""
-            doc = fitz.open(path)
-            for page_num, page in enumerate(doc):
+            # MuPDF must not render one document from several threads at once
+            render_lock = threading.Lock()
+
+            def ocr_page(page_num: int) -> Optional[str]:
                 try:
-                    pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-                    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                    page_text = pytesseract.image_to_string(img, config='--psm 6')
-                    text += page_text + "\n"
+                    with render_lock:
+                        page = pdf[page_num]
+                        zoom = self._ocr_zoom(page)
+                        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                    # Tesseract runs outside the GIL, so pages are recognized concurrently
+                    return self._ocr_pixmap(pix)
                 except Exception as page_error:
                     logger.warning(f"OCR failed for page {page_num} in {path.name}: {page_error}")
-            doc.close()
-            
-            doc_type = self.detect_document_type(text, path.name)
-            cleaned_text = self.clean_text_dynamic(text, doc_type)
-            quality_score = self.calculate_quality_score(cleaned_text, doc_type)
+                    return None
+
+            with _fitz_document(path, doc) as pdf:
+                page_texts = list(self._get_ocr_pool().map(ocr_page, range(pdf.page_count)))
+            text = "".join(page_text + "\n" for page_text in page_texts if page_text is not None)
             
-            return ExtractionResult(
-                text=cleaned_text,
-                doc_type=doc_type,
-                method_used="OCR",
-                quality_score=quality_score,
-                encoding_issues=sum(cleaned_text.count(bad) for bad in self.config['encoding_fixes'].keys()),
-                word_count=len(cleaned_text.split()),
-                has_structure=bool(re.search(r'\n\d+\.\s+', cleaned_text))
-            )
+            return self._build_result(text, path.name, "OCR")
             
         except Exception as e:
             logger.error(f"OCR extraction failed for {path.name}: {e}")
             return ExtractionResult("", "unknown", "OCR", 0, 0, 0, False)
 
+    def _needs_ocr(self, path: Path, doc=None, probe_pages: int = 2) -> bool:
+        """Probe the first pages for a text layer; too little text means a scan."""
+        try:
+            with _fitz_document(path, doc) as doc:
+                chars = sum(len(doc[i].get_text("text").strip())
+                            for i in range(min(probe_pages, doc.page_count)))
+        except Exception as e:
+            logger.warning(f"Text-layer probe failed for {path.name}: {e}")
+            return False
+        return chars < self.config['min_text_length']
+
+    def _cache_file(self, pdf_path: Path) -> Path:
+        """Cache entry for a PDF, keyed by a hash of its bytes."""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(pdf_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return self.cache_folder / f"{digest.hexdigest()}.json"
+
+    def _load_cached_result(self, cache_file: Path) -> Optional[ExtractionResult]:
+        """Return the cached extraction if it was made with the current config."""
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('config_hash') != self._config_hash:
+                return None
+            return ExtractionResult(**cached['result'])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            # Unreadable, or written by an older ExtractionResult schema: treat as a miss
+            logger.warning(f"Ignoring unreadable cache entry {cache_file.name}: {e}")
+            return None
+
+    def _save_cached_result(self, cache_file: Path, result: ExtractionResult):
+        """Store an extraction so an unchanged PDF is not extracted again."""
+        try:
+            self.cache_folder.mkdir(parents=True, exist_ok=True)
+            cache_file.write_bytes(_dump_json({'config_hash': self._config_hash, 'result': asdict(result)}))
+        except OSError as e:
+            logger.warning(f"Failed to cache extraction for {cache_file.name}: {e}")
+
     def process_single_pdf(self, pdf_path: Path) -> Optional[ExtractionResult]:
         """Process a single PDF with dynamic method selection."""
         logger.info(f"Processing: {pdf_path.name}")
         
-        # Try extraction methods in order of preference
-        methods = [
-            self.extract_text_pdfplumber,
-            self.extract_text_pymupdf,
-            self.extract_text_ocr
-        ]
+        cache_file = self._cache_file(pdf_path)
+        cached = self._load_cached_result(cache_file)
+        if cached is not None:
+            logger.info(f"  ✓ Unchanged since last run, reusing {cached.method_used} result "
+                        f"(Type: {cached.doc_type}, Quality: {cached.quality_score})")
+            return cached
+        
+        # Parse the PDF once for the probe, PyMuPDF and OCR; each opens it itself if this fails
+        try:
+            doc = fitz.open(pdf_path)
+        except Exception as e:
+            logger.warning(f"PyMuPDF could not open {pdf_path.name}: {e}")
+            doc = None
+        try:
+            best_result = self._extract_best(pdf_path, doc)
+        finally:
+            if doc is not None:
+                doc.close()
+        
+        if best_result is not None and best_result.text:
+            self._save_cached_result(cache_file, best_result)
+        return best_result
+
+    def _extract_best(self, pdf_path: Path, doc) -> Optional[ExtractionResult]:
+        """Try the extraction methods in turn, stopping at the first good enough result."""
+        # Try extraction methods in order of preference; scanned files go straight to OCR
+        if self._needs_ocr(pdf_path, doc):
+            logger.info("  No text layer found, starting with OCR")
+            methods = [
+                self.extract_text_ocr,
+                self.extract_text_pymupdf,
+                self.extract_text_pdfplumber
+            ]
+        else:
+            methods = [
+                self.extract_text_pymupdf,
+                self.extract_text_pdfplumber,
+                self.extract_text_ocr
+            ]
         
         best_result = None
         
         for method in methods:
             try:
-                result = method(pdf_path)
+                result = method(pdf_path, doc)
                 
                 if result.quality_score >= self.config['quality_threshold']:
                     logger.info(f"  ✓ Success with {result.method_used} "
@@ -433,8 +660,7 @@ class DynamicPDFExtractor:
                 'extraction_timestamp': datetime.now().isoformat()
             }
             
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2)
+            metadata_file.write_bytes(_dump_json(metadata))
             
             logger.info(f"  ✅ Saved: {text_file.name} "
                        f"({len(result.text)} chars, {result.doc_type}, Q:{result.quality_score})")
@@ -451,6 +677,24 @@ class DynamicPDFExtractor:
             logger.error(f"Failed to save results for {pdf_path.name}: {e}")
             return False
 
+    def process_and_save(self, pdf_path: Path) -> Tuple[Optional[ExtractionResult], bool]:
+        """Extract one PDF and save the result; returns the result and whether it was saved."""
+        result = self.process_single_pdf(pdf_path)
+        success = False
+        
+        if result:
+            success = self.save_extraction_result(pdf_path, result)
+        
+        return result, success
+
+    def _record_outcome(self, pdf_path: Path, result: Optional[ExtractionResult], success: bool):
+        """Log and count the outcome for one PDF."""
+        if not success:
+            logger.error(f"  ❌ Failed to process {pdf_path.name}")
+        
+        self.update_stats(result if result else ExtractionResult("", "unknown", "None", 0, 0, 0, False), success)
+        logger.info("")  # Empty line for readability
+
     def update_stats(self, result: ExtractionResult, success: bool):
         """Update processing statistics."""
         if success:
@@ -471,18 +715,29 @@ class DynamicPDFExtractor:
         logger.info(f"Found {len(pdf_files)} PDF files to process")
         logger.info("-" * 60)
         
-        for pdf_file in pdf_files:
-            result = self.process_single_pdf(pdf_file)
-            success = False
-            
-            if result:
-                success = self.save_extraction_result(pdf_file, result)
-            
-            if not success:
-                logger.error(f"  ❌ Failed to process {pdf_file.name}")
-            
-            self.update_stats(result if result else ExtractionResult("", "unknown", "None", 0, 0, 0, False), success)
-            logger.info("")  # Empty line for readability
+        # PDFs are independent, so extract them in parallel; stats are gathered here as each finishes
+        max_workers = min(len(pdf_files), os.cpu_count() or 1)
+        if max_workers > 1:
+            # Split the cores between worker processes so OCR threads don't oversubscribe them
+            ocr_threads = max(1, (os.cpu_count() or 1) // max_workers)
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(str(self.input_folder), str(self.output_folder),
+                                               ocr_threads)) as pool:
+                futures = {pool.submit(_process_and_save, pdf_file): pdf_file for pdf_file in pdf_files}
+                for future in as_completed(futures):
+                    try:
+                        result, success = future.result()
+                    except Exception as e:
+                        logger.error(f"  ✗ Worker failed on {futures[future].name}: {e}")
+                        result, success = None, False
+                    self._record_outcome(futures[future], result, success)
+        else:
+            try:
+                for pdf_file in pdf_files:
+                    result, success = self.process_and_save(pdf_file)
+                    self._record_outcome(pdf_file, result, success)
+            finally:
+                self.shutdown_ocr_pool()
         
         # Generate final report
         self.generate_report()
@@ -514,11 +769,39 @@ class DynamicPDFExtractor:
         
         # Save report to file
         report_file = self.output_folder / "extraction_report.json"
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(self.stats, f, indent=2)
+        report_file.write_bytes(_dump_json(self.stats, indent=True))
+
+@contextmanager
+def _fitz_document(path: Path, doc=None) -> Iterator:
+    """Yield ``doc`` if the caller already opened it, else open ``path`` and close it afterwards."""
+    if doc is not None:
+        yield doc
+        return
+    doc = fitz.open(path)
+    try:
+        yield doc
+    finally:
+        doc.close()
+
+# One extractor per worker process, built by the pool initializer
+_worker_extractor: Optional[DynamicPDFExtractor] = None
+
+def _init_worker(input_folder: str, output_folder: str, ocr_threads: int):
+    """Build the worker's extractor (config and Tesseract lookup) once."""
+    global _worker_extractor
+    _configure_logging()
+    _limit_tesseract_threads()
+    DynamicPDFExtractor.ocr_threads = ocr_threads
+    _worker_extractor = DynamicPDFExtractor(input_folder, output_folder)
+
+def _process_and_save(pdf_path: Path) -> Tuple[Optional[ExtractionResult], bool]:
+    """Extract and save one PDF in a worker process."""
+    return _worker_extractor.process_and_save(pdf_path)
 
 def main():
     """Main function to run the dynamic PDF extractor."""
+    _configure_logging()
+    _limit_tesseract_threads()
     extractor = DynamicPDFExtractor()
     stats = extractor.process_all_pdfs()
     
@@ -14,23 +14,49 @@ import logging
 
 logger = logging.getLogger("genai_legal.gemini")
 
-try:
-    import google.generativeai as genai  # type: ignore
-    _HAS_GENAI = True
-except Exception:
-    genai = None  # type: ignore
-    _HAS_GENAI = False
+# google.generativeai is slow to import, so it is loaded on first use and cached here
+genai = None  # type: ignore
+_GENAI_IMPORT_FAILED = False
+# API key genai was last configured with, so repeat calls skip configure()
+_configured_key: Optional[str] = None
+
+# Context budget per request; keeps prompt size, latency and cost bounded for long documents
+MAX_CLAUSE_CHARS = 1500
+MAX_CONTEXT_CHARS = 12000
+
+
+def _load_genai() -> bool:
+    """Import google.generativeai once; return True if it is available."""
+    global genai, _GENAI_IMPORT_FAILED
+    if genai is None and not _GENAI_IMPORT_FAILED:
+        try:
+            import google.generativeai as _genai  # type: ignore
+            genai = _genai
+        except Exception:
+            _GENAI_IMPORT_FAILED = True
+    return genai is not None
 
 
 def is_configured() -> bool:
     """Return True if the adapter appears configured and the library is present."""
-    if not _HAS_GENAI:
+    if not (os.environ.get("GOOGLE_API_KEY") or os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")):
         return False
-    if os.environ.get("GOOGLE_API_KEY"):
-        return True
-    if os.environ.get("GOOGLE_APPLICATION_CREDENTIALS"):
-        return True
-    return False
+    return _load_genai()
+
+
+def _build_context(relevant_clauses: List[Dict[str, Any]], max_clauses: int = 6) -> str:
+    """Join the top clauses into a prompt context, truncating to the character budget."""
+    parts = []
+    remaining = MAX_CONTEXT_CHARS
+    for i, c in enumerate(relevant_clauses[:max_clauses]):
+        part = f"Clause {i+1}: {c.get('original_text','')[:MAX_CLAUSE_CHARS]}"
+        if parts:
+            remaining -= 1  # joining newline
+        if remaining <= 0:
+            break
+        parts.append(part[:remaining])
+        remaining -= len(parts[-1])
+    return "\n".join(parts)
 
 
 def generate_answer_gemini(question: str, relevant_clauses: List[Dict[str, Any]]) -> Optional[str]:
@@ -44,14 +70,15 @@ def generate_answer_gemini(question: str, relevant_clauses: List[Dict[str, Any]]
 
     try:
         # Configure the library with explicit API key if provided
+        global _configured_key
         api_key = os.environ.get("GOOGLE_API_KEY")
-        if api_key:
+        if api_key and api_key != _configured_key:
             genai.configure(api_key=api_key)
+            _configured_key = api_key
 
         model = os.environ.get("GEMINI_MODEL", "chat-bison")
         # Compose a concise prompt with context
-        context_parts = [f"Clause {i+1}: {c.get('original_text','')}" for i, c in enumerate(relevant_clauses[:6])]
-        context = "\n".join(context_parts)
+        context = _build_context(relevant_clauses)
 
         system_prompt = (
             "You are an assistant that answers questions specifically about the provided legal document. "
@@ -73,7 +100,7 @@ def generate_answer_gemini(question: str, relevant_clauses: List[Dict[str, Any]]
                 text = getattr(resp, 'output', '') or str(resp)
         else:
             # Older generate_text interface
-            prompt = system_prompt + "\n\n" + context + "\n\nQuestion: " + question
+            prompt = "".join([system_prompt, "\n\n", context, "\n\nQuestion: ", question])
             resp = genai.generate_text(model=model, prompt=prompt)
             text = getattr(resp, 'text', str(resp))
 
@@ -3,28 +3,76 @@ Complete Legal Document Analysis API with all required endpoints
 Implements: /upload, /analyze/{file_id}, /results/{file_id}, /chat/{file_id}
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, JSONResponse, ORJSONResponse
 from pydantic import BaseModel
-from typing import Dict, List, Optional, Any
-import uuid
+from typing import Dict, List, Optional, Any, Set, Tuple
+import re
+import secrets
+import heapq
+import sqlite3
+import zlib
+import hashlib
 import os
 import shutil
 import time
 import json
 import asyncio
-from datetime import datetime, timedelta
+import threading
+import numpy as np
+from datetime import datetime
 from pathlib import Path
+from dataclasses import dataclass
 import logging
+
+# Number of uvicorn worker processes (uvicorn's own CLI reads the same variable); each worker
+# sizes its thread pools to its share of the cores. uvicorn runs one worker when it is unset;
+# running main.py directly starts one per core
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+CPU_SHARE = max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY)
+
+# BLAS/OpenMP read these when torch is first imported, so they are set before sentence-transformers
+os.environ.setdefault("OMP_NUM_THREADS", str(CPU_SHARE))
+os.environ.setdefault("MKL_NUM_THREADS", str(CPU_SHARE))
+
 try:
-    from sentence_transformers import SentenceTransformer, util
+    from sentence_transformers import SentenceTransformer
 except Exception as _e:
     # sentence-transformers is an optional dependency for semantic search.
     # Fall back gracefully so the API can run without it (uses mock search).
     SentenceTransformer = None
-    util = None
+try:
+    import orjson
+except Exception:
+    # orjson is optional; results fall back to the stdlib json module.
+    orjson = None
+try:
+    from cachetools import TTLCache
+except Exception:
+    # cachetools is optional; without it the in-memory caches are unbounded dicts.
+    TTLCache = None
+try:
+    import aiofiles
+except Exception:
+    # aiofiles is optional; without it uploads are written with blocking file I/O.
+    aiofiles = None
+try:
+    import faiss
+except Exception:
+    # faiss is optional; without it chat falls back to encoding clauses per request.
+    faiss = None
+try:
+    import ahocorasick
+except Exception:
+    # pyahocorasick is optional; risk keywords fall back to one substring test per keyword.
+    ahocorasick = None
 
-app = FastAPI(title="Legal Document Analysis API", version="1.0.0")
+app = FastAPI(
+    title="Legal Document Analysis API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
+)
 
 # Simple module logger
 logger = logging.getLogger("genai_legal")
@@ -67,18 +115,184 @@ RESULTS_DIR = "results/"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(RESULTS_DIR, exist_ok=True)
 
-# In-memory storage for quick access
-documents: Dict[str, Dict[str, Any]] = {}
-file_metadata: Dict[str, Dict[str, Any]] = {}
+# Bounds for the per-document in-memory caches; evicted entries are rebuilt from disk on demand
+DOCUMENT_CACHE_SIZE = 64
+DOCUMENT_CACHE_TTL_SECONDS = 900
+CHAT_INDEX_CACHE_TTL_SECONDS = 1800
+
+def _bounded_cache(ttl: int) -> Dict[str, Any]:
+    """LRU cache with a time-to-live per entry, or a plain dict without cachetools."""
+    if TTLCache is None:
+        return {}
+    return TTLCache(maxsize=DOCUMENT_CACHE_SIZE, ttl=ttl)
+
+# In-memory storage for quick access. These maps are per uvicorn worker; the files and results
+# rows in the state database are authoritative and check_document validates them on every request
+documents: Dict[str, Dict[str, Any]] = _bounded_cache(DOCUMENT_CACHE_TTL_SECONDS)
+file_metadata: Dict[str, "FileMeta"] = {}
+# Column-wise view of each document's clauses (ids, texts, token sets) used by chat
+clause_columns: Dict[str, Dict[str, List[Any]]] = _bounded_cache(DOCUMENT_CACHE_TTL_SECONDS)
+# Serialized /api/results response body and its ETag per document, built on first request
+results_payloads: Dict[str, Tuple[bytes, str]] = _bounded_cache(DOCUMENT_CACHE_TTL_SECONDS)
+# Inner-product FAISS index over each document's normalized clause embeddings
+chat_indices: Dict[str, Any] = _bounded_cache(CHAT_INDEX_CACHE_TTL_SECONDS)
+# float32 copy of each document's clause embeddings, used for scoring when FAISS is unavailable
+chat_embeddings: Dict[str, np.ndarray] = _bounded_cache(CHAT_INDEX_CACHE_TTL_SECONDS)
+# Recent chat responses per document, keyed by the normalized question embedding
+answer_cache: Dict[str, List[Dict[str, Any]]] = {}
+# analysis_time of the stored results the caches above were built from, per document
+cache_versions: Dict[str, str] = {}
+
+# Background analyses running in this worker, held so they are not garbage collected; which files
+# are being analyzed is tracked in the files table, across all workers
+analysis_tasks: Set[asyncio.Task] = set()
+# A queued/processing claim older than this is assumed lost with its worker and may be taken again
+ANALYSIS_STALE_SECONDS = 900
+
+# Uploads are streamed to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1 << 20
 
 # Auto-delete configuration
 AUTO_DELETE_HOURS = 24
 
+# File metadata and analysis results persist in SQLite so they survive restarts
+STATE_DB_PATH = os.path.join(RESULTS_DIR, "state.db")
+
+def _open_state_db() -> sqlite3.Connection:
+    """Open the state database in WAL mode and create its tables."""
+    conn = sqlite3.connect(STATE_DB_PATH, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS files (
+            file_id TEXT PRIMARY KEY,
+            filename TEXT NOT NULL,
+            path TEXT NOT NULL,
+            status TEXT NOT NULL,
+            upload_ts TEXT NOT NULL,
+            expiry_ts REAL NOT NULL,
+            sha256 TEXT,
+            error TEXT,
+            status_ts REAL NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS files_expiry ON files (expiry_ts);
+        CREATE INDEX IF NOT EXISTS files_sha256 ON files (sha256);
+        CREATE TABLE IF NOT EXISTS results (
+            file_id TEXT PRIMARY KEY,
+            filename TEXT NOT NULL,
+            risk_summary TEXT NOT NULL,
+            total_clauses INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            analysis_time TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS clauses (
+            file_id TEXT NOT NULL,
+            idx INTEGER NOT NULL,
+            clause_id TEXT NOT NULL,
+            text BLOB NOT NULL,
+            summary TEXT NOT NULL,
+            risk TEXT NOT NULL,
+            word_count INTEGER NOT NULL,
+            PRIMARY KEY (file_id, idx)
+        );
+    """)
+    # Columns added after the first release; another worker may be adding them at the same time
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(files)")}
+    for column, declaration in (("error", "TEXT"), ("status_ts", "REAL NOT NULL DEFAULT 0")):
+        if column not in columns:
+            try:
+                conn.execute(f"ALTER TABLE files ADD COLUMN {column} {declaration}")
+            except sqlite3.OperationalError:
+                pass
+    return conn
+
+state_db = _open_state_db()
+# Results are written from a worker thread; serialize every use of the shared connection
+state_db_lock = threading.Lock()
+
+# Clause text is stored zlib-compressed; a fast level keeps analyze latency flat
+CLAUSE_TEXT_COMPRESSION_LEVEL = 3
+
+# Min-heap of (expiry timestamp, file_id, file_path) drained by reap_expired_files
+expiry_heap: List[Tuple[float, str, str]] = []
+expiry_wakeup: Optional[asyncio.Event] = None
+
+# Semantic answer cache: reuse an answer when a new question is this similar to a cached one
+ANSWER_CACHE_SIMILARITY = 0.85
+ANSWER_CACHE_MAX_ENTRIES = 128
+ANSWER_CACHE_TTL_SECONDS = 300
+
+# Accepted upload content types and the file kind their bytes must sniff as
+ALLOWED_CONTENT_TYPES = {
+    "application/pdf": "pdf",
+    "application/msword": "doc",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+}
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+# Set EMBEDDER_QUANTIZED=0 to force the FP32 PyTorch embedder
+EMBEDDER_QUANTIZED = os.getenv("EMBEDDER_QUANTIZED", "1") != "0"
+
+def _quantized_onnx_file() -> Optional[str]:
+    """Pick the int8 ONNX export shipped with the model that suits this CPU, if any."""
+    try:
+        with open("/proc/cpuinfo") as f:
+            flags = f.read()
+    except OSError:
+        return None
+    if "avx512_vnni" in flags:
+        return "onnx/model_qint8_avx512_vnni.onnx"
+    if "avx2" in flags:
+        return "onnx/model_quint8_avx2.onnx"
+    # int8 matmul without VNNI/AVX2 is slower than FP32, keep the PyTorch model
+    return None
+
+def _onnx_session_options():
+    """Session options for the shared ONNX Runtime embedder session, or None without onnxruntime."""
+    try:
+        import onnxruntime as ort
+    except Exception:
+        return None
+    opts = ort.SessionOptions()
+    opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # Roughly one thread per physical core of this worker's share; more oversubscribes the other workers
+    opts.intra_op_num_threads = max(1, CPU_SHARE // 2)
+    opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    opts.enable_mem_pattern = True
+    return opts
+
+def _set_torch_threads():
+    """Give the FP32 torch embedder this worker's share of the cores instead of torch's default."""
+    try:
+        import torch
+        torch.set_num_threads(int(os.getenv("TORCH_NUM_THREADS", str(CPU_SHARE))))
+        torch.set_num_interop_threads(2)
+    except Exception as e:
+        # set_num_interop_threads raises once torch has run any parallel work
+        print(f"Warning: Could not set torch thread counts: {e}")
+
+def _load_embedder():
+    """Load the sentence embedder, preferring an int8-quantized ONNX Runtime backend."""
+    onnx_file = _quantized_onnx_file() if EMBEDDER_QUANTIZED else None
+    if onnx_file:
+        try:
+            model_kwargs = {"file_name": onnx_file, "provider": "CPUExecutionProvider"}
+            session_options = _onnx_session_options()
+            if session_options is not None:
+                model_kwargs["session_options"] = session_options
+            model = SentenceTransformer(EMBEDDING_MODEL, backend="onnx", model_kwargs=model_kwargs)
+            print(f"Using quantized ONNX embedder ({onnx_file})")
+            return model
+        except Exception as e:
+            print(f"Warning: Could not load quantized ONNX embedder, using FP32 model: {e}")
+    _set_torch_threads()
+    return SentenceTransformer(EMBEDDING_MODEL)
+
 # Load embeddings model once (lightweight model for fast inference)
 embedder = None
 if SentenceTransformer is not None:
     try:
-        embedder = SentenceTransformer("all-MiniLM-L6-v2")
+        embedder = _load_embedder()
         print("Semantic search model loaded successfully")
     except Exception as e:
         print(f"Warning: Could not load semantic search model: {e}")
@@ -86,6 +300,17 @@ if SentenceTransformer is not None:
 else:
     print("Warning: sentence-transformers not available; semantic search disabled")
 
+@dataclass
+class FileMeta:
+    """Metadata for an uploaded file; slotted, since one is kept per upload for its whole lifetime."""
+    __slots__ = ("filename", "file_path", "upload_time", "status", "sha256", "error")
+    filename: str
+    file_path: str
+    upload_time: str
+    status: str
+    sha256: Optional[str]
+    error: Optional[str]
+
 class QuestionRequest(BaseModel):
     # Legacy request model for /ask kept for backward compatibility
     question: str
@@ -113,92 +338,119 @@ def extract_text(file_path: str) -> str:
     Clause 5: Disputes shall be resolved through binding arbitration in the jurisdiction of the property.
     """
 
+_CLAUSE_HEADER_RE = re.compile(r'Clause \d+:')
+
 def split_clauses(text: str) -> List[str]:
     """Mock clause splitting - replace with real NLP processing."""
     # Simple split by "Clause X:" pattern
-    import re
-    clauses = re.split(r'Clause \d+:', text)
+    clauses = _CLAUSE_HEADER_RE.split(text)
     return [clause.strip() for clause in clauses if clause.strip()]
 
+_WORD_RE = re.compile(r"\S+")
+
+def count_words(text: str) -> int:
+    """Count whitespace-separated words without building the list of substrings."""
+    return sum(1 for _ in _WORD_RE.finditer(text))
+
 def summarize_clause(clause: str) -> str:
     """Mock summarization - replace with real LLM."""
     if len(clause) > 100:
         return clause[:100] + "..."
     return clause
 
-def classify_risk(clause: str) -> str:
-    """Enhanced risk classification with better heuristics."""
-    clause_lower = clause.lower()
-    
+# Risk keywords by weight; a keyword counts once per clause however often it appears
+RISK_KEYWORD_WEIGHTS = {
     # High risk indicators
-    high_risk_keywords = [
+    3: (
         'penalty', 'fine', 'termination', 'breach', 'default', 'dispute', 'arbitration',
         'liability', 'damages', 'indemnify', 'warranty', 'guarantee', 'forfeit',
         'liquidated damages', 'consequential damages', 'punitive', 'criminal',
         'prosecution', 'lawsuit', 'litigation', 'court', 'judgment', 'enforce',
         'irrevocable', 'binding', 'mandatory', 'required', 'must', 'shall not',
         'prohibited', 'forbidden', 'illegal', 'unlawful', 'violation'
-    ]
-    
+    ),
     # Medium risk indicators
-    medium_risk_keywords = [
+    2: (
         'notice', 'payment', 'maintenance', 'repair', 'renewal', 'extension',
         'modification', 'amendment', 'change', 'update', 'revise', 'alter',
         'schedule', 'timeline', 'deadline', 'due date', 'expiration', 'expire',
         'renew', 'extend', 'continue', 'ongoing', 'permanent', 'temporary',
         'condition', 'requirement', 'obligation', 'responsibility', 'duty',
         'comply', 'adhere', 'follow', 'observe', 'respect', 'honor'
-    ]
-    
+    ),
     # Low risk indicators
-    low_risk_keywords = [
+    1: (
         'information', 'data', 'record', 'document', 'file', 'copy', 'duplicate',
         'reference', 'example', 'sample', 'template', 'format', 'structure',
         'description', 'explanation', 'clarification', 'definition', 'meaning',
         'purpose', 'objective', 'goal', 'aim', 'intent', 'intention', 'scope',
         'coverage', 'inclusion', 'exclusion', 'exception', 'special', 'particular'
-    ]
-    
-    # Count keyword matches
-    high_count = sum(1 for keyword in high_risk_keywords if keyword in clause_lower)
-    medium_count = sum(1 for keyword in medium_risk_keywords if keyword in clause_lower)
-    low_count = sum(1 for keyword in low_risk_keywords if keyword in clause_lower)
-    
-    # Additional heuristics
-    has_penalty_language = any(phrase in clause_lower for phrase in [
-        'penalty of', 'fine of', 'charge of', 'cost of', 'fee of', 'amount of'
-    ])
-    
-    has_legal_action = any(phrase in clause_lower for phrase in [
-        'legal action', 'court action', 'sue', 'sued', 'lawsuit', 'litigation'
-    ])
-    
-    has_time_pressure = any(phrase in clause_lower for phrase in [
-        'immediately', 'urgent', 'asap', 'within 24 hours', 'within 48 hours',
-        'without delay', 'promptly', 'expeditiously'
-    ])
-    
-    # Scoring system
-    risk_score = 0
-    
-    # Base keyword scoring
-    risk_score += high_count * 3
-    risk_score += medium_count * 2
-    risk_score += low_count * 1
+    ),
+}
+RISK_KEYWORD_WEIGHT = {keyword: weight for weight, keywords in RISK_KEYWORD_WEIGHTS.items() for keyword in keywords}
+
+def _phrase_pattern(phrases: List[str]) -> "re.Pattern":
+    """One regex that finds any of the literal phrases."""
+    return re.compile("|".join(map(re.escape, phrases)))
+
+# Additional heuristics: score added once if any phrase of the group appears
+PENALTY_PHRASES = ('penalty of', 'fine of', 'charge of', 'cost of', 'fee of', 'amount of')
+LEGAL_ACTION_PHRASES = ('legal action', 'court action', 'sue', 'sued', 'lawsuit', 'litigation')
+TIME_PRESSURE_PHRASES = (
+    'immediately', 'urgent', 'asap', 'within 24 hours', 'within 48 hours',
+    'without delay', 'promptly', 'expeditiously'
+)
+RISK_PHRASE_BONUSES = ((PENALTY_PHRASES, 5), (LEGAL_ACTION_PHRASES, 8), (TIME_PRESSURE_PHRASES, 3))
+PENALTY_LANGUAGE_RE = _phrase_pattern(PENALTY_PHRASES)
+LEGAL_ACTION_RE = _phrase_pattern(LEGAL_ACTION_PHRASES)
+TIME_PRESSURE_RE = _phrase_pattern(TIME_PRESSURE_PHRASES)
+COMPLEX_PUNCTUATION_RE = re.compile(r"[;:()\[\]]")
+# A clause needs at least this many characters to have more than LONG_CLAUSE_WORDS words
+LONG_CLAUSE_WORDS = 50
+LONG_CLAUSE_MIN_CHARS = 2 * LONG_CLAUSE_WORDS + 1
+
+# Bonus groups each phrase belongs to, by index into RISK_PHRASE_BONUSES
+_PHRASE_BONUS_GROUPS: Dict[str, Tuple[int, ...]] = {}
+for _group, (_phrases, _) in enumerate(RISK_PHRASE_BONUSES):
+    for _phrase in _phrases:
+        _PHRASE_BONUS_GROUPS[_phrase] = _PHRASE_BONUS_GROUPS.get(_phrase, ()) + (_group,)
+
+# Risk keywords and bonus phrases matched in one pass over the clause when pyahocorasick is installed
+_risk_automaton = None
+if ahocorasick is not None:
+    _risk_automaton = ahocorasick.Automaton()
+    for _keyword in RISK_KEYWORD_WEIGHT.keys() | _PHRASE_BONUS_GROUPS.keys():
+        _risk_automaton.add_word(_keyword, _keyword)
+    _risk_automaton.make_automaton()
+
+def classify_risk(clause: str) -> str:
+    """Enhanced risk classification with better heuristics."""
+    clause_lower = clause.lower()
     
-    # Additional risk factors
-    if has_penalty_language:
-        risk_score += 5
-    if has_legal_action:
-        risk_score += 8
-    if has_time_pressure:
-        risk_score += 3
+    if _risk_automaton is not None:
+        # Keywords and bonus phrases from a single scan
+        found = {keyword for _, keyword in _risk_automaton.iter(clause_lower)}
+        risk_score = sum(RISK_KEYWORD_WEIGHT.get(keyword, 0) for keyword in found)
+        groups = {group for keyword in found for group in _PHRASE_BONUS_GROUPS.get(keyword, ())}
+        risk_score += sum(RISK_PHRASE_BONUSES[group][1] for group in groups)
+    else:
+        # Base keyword scoring
+        found = [keyword for keyword in RISK_KEYWORD_WEIGHT if keyword in clause_lower]
+        risk_score = sum(RISK_KEYWORD_WEIGHT[keyword] for keyword in found)
+
+        # Additional risk factors
+        if PENALTY_LANGUAGE_RE.search(clause_lower):
+            risk_score += 5
+        if LEGAL_ACTION_RE.search(clause_lower):
+            risk_score += 8
+        if TIME_PRESSURE_RE.search(clause_lower):
+            risk_score += 3
     
-    # Length and complexity factors
-    if len(clause.split()) > 50:  # Very long clauses are often complex
+    # Length and complexity factors; short clauses cannot reach the word limit, so skip counting
+    if len(clause) >= LONG_CLAUSE_MIN_CHARS and count_words(clause) > LONG_CLAUSE_WORDS:  # Very long clauses are often complex
         risk_score += 2
     
-    if any(char in clause for char in [';', ':', '(', ')', '[', ']']):  # Complex punctuation
+    if COMPLEX_PUNCTUATION_RE.search(clause):  # Complex punctuation
         risk_score += 1
     
     # Determine risk level
@@ -209,109 +461,513 @@ def classify_risk(clause: str) -> str:
     else:
         return "Low"
 
-def build_embeddings(texts: List[str]) -> List[List[float]]:
-    """Mock embeddings - replace with real vector embeddings."""
-    import random
-    return [[random.random() for _ in range(10)] for _ in texts]
+def summarize_clauses_batch(clauses: List[str]) -> List[str]:
+    """Summarize all clauses of a document in one call (batch entry point for a real model)."""
+    return [summarize_clause(clause) for clause in clauses]
+
+def classify_risks_batch(clauses: List[str]) -> List[str]:
+    """Classify the risk of all clauses of a document in one call."""
+    return [classify_risk(clause) for clause in clauses]
+
+# Clauses per forward pass when embedding a document
+EMBED_BATCH_SIZE = 64
+
+def build_embeddings(texts: List[str]) -> np.ndarray:
+    """Embed clauses with the semantic search model (mock vectors if it is unavailable)."""
+    if embedder is not None:
+        # encode() already groups texts by length so each mini-batch pads little; the progress
+        # bar would otherwise be shown because the app logs at INFO
+        return embedder.encode(texts, batch_size=EMBED_BATCH_SIZE, convert_to_numpy=True,
+                               normalize_embeddings=True, show_progress_bar=False)
+    return np.random.rand(len(texts), 10).astype(np.float32)
 
-def semantic_search(query: str, embeddings: List[List[float]]) -> List[int]:
-    """Mock semantic search - replace with real vector search."""
-    # Return all indices for now
-    return list(range(len(embeddings)))
+# Concurrent embedding requests arriving within these windows share one forward pass; chat
+# questions wait far less since a user is waiting on each one
+EMBED_BATCH_WINDOW_SECONDS = 0.05
+QUESTION_BATCH_WINDOW_SECONDS = 0.005
+_pending_embeddings: List[Tuple[List[str], asyncio.Future]] = []
+_pending_questions: List[Tuple[List[str], asyncio.Future]] = []
+# Running flush tasks; the event loop only keeps weak references, so hold them until they finish
+_flush_tasks: Set[asyncio.Task] = set()
+
+async def embed_clauses(texts: List[str]) -> np.ndarray:
+    """Embed clauses, coalescing concurrent /analyze calls into a single batched encode."""
+    return await _coalesce(_pending_embeddings, texts, EMBED_BATCH_WINDOW_SECONDS, build_embeddings)
+
+async def embed_question(question: str) -> np.ndarray:
+    """Embed a chat question, coalescing concurrent /chat calls into a single batched encode."""
+    return await _coalesce(_pending_questions, [question], QUESTION_BATCH_WINDOW_SECONDS, encode_questions)
+
+async def _coalesce(pending: List[Tuple[List[str], asyncio.Future]], texts: List[str], window: float, encode) -> np.ndarray:
+    """Queue texts for the next batched encode, starting the batch window if none is open."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    pending.append((texts, future))
+    if len(pending) == 1:
+        loop.call_later(window, _start_flush, pending, encode)
+    return await future
+
+def _start_flush(pending: List[Tuple[List[str], asyncio.Future]], encode):
+    """Start the task that encodes a closed batch window."""
+    task = asyncio.create_task(_flush_embeddings(pending, encode))
+    _flush_tasks.add(task)
+    task.add_done_callback(_flush_tasks.discard)
+
+async def _flush_embeddings(pending: List[Tuple[List[str], asyncio.Future]], encode):
+    """Encode every pending embedding request at once and hand each caller its rows."""
+    batch = pending[:]
+    pending.clear()
+    texts = [text for request_texts, _ in batch for text in request_texts]
+    try:
+        vectors = await asyncio.to_thread(encode, texts)
+    except Exception as e:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(e)
+        return
+
+    start = 0
+    for request_texts, future in batch:
+        if not future.done():
+            future.set_result(vectors[start:start + len(request_texts)])
+        start += len(request_texts)
+
+def semantic_search(question_embedding: np.ndarray, embeddings: np.ndarray, top_k: int) -> Tuple[List[int], List[float]]:
+    """Top-k clauses by cosine similarity against a matrix of normalized clause embeddings.
+
+    Scoring runs in float32: numpy has no BLAS path for float16 matmuls, so pass
+    the upcast matrix from get_chat_embeddings rather than the float16 sidecar.
+    """
+    query = np.asarray(question_embedding, dtype=np.float32).reshape(-1)
+    scores = np.asarray(embeddings, dtype=np.float32) @ query
+    top_k = min(top_k, len(scores))
+    if top_k == 0:
+        return [], []
+    top = np.argpartition(-scores, top_k - 1)[:top_k]
+    top = top[np.argsort(-scores[top])]
+    return top.tolist(), scores[top].astype(np.float32).tolist()
 
 def generate_answer(question: str, relevant_clauses: List[Dict[str, Any]]) -> str:
     """Mock answer generation - replace with real LLM."""
     context = "\n".join([f"Clause {i+1}: {clause['original_text']}" for i, clause in enumerate(relevant_clauses)])
     return f"Based on the document analysis, here's what I found regarding '{question}':\n\n{context[:200]}..."
 
+def sniff_file_type(header: bytes) -> Optional[str]:
+    """Identify a document kind from its leading magic bytes."""
+    if header.startswith(b"%PDF-"):
+        return "pdf"
+    if header.startswith(b"PK\x03\x04"):
+        return "docx"
+    if header.startswith(b"\xd0\xcf\x11\xe0"):
+        return "doc"
+    return None
+
+def get_file_meta(file_id: str) -> Optional[FileMeta]:
+    """Return a file's metadata, loading it from the state database if another worker took the upload."""
+    metadata = file_metadata.get(file_id)
+    if metadata is None:
+        with state_db_lock:
+            row = state_db.execute(
+                "SELECT filename, path, upload_ts, status, sha256, error FROM files WHERE file_id = ?", (file_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        metadata = file_metadata[file_id] = FileMeta(*row)
+    return metadata
+
+def forget_document(file_id: str):
+    """Drop every in-memory entry this worker holds for a document."""
+    documents.pop(file_id, None)
+    clause_columns.pop(file_id, None)
+    chat_indices.pop(file_id, None)
+    chat_embeddings.pop(file_id, None)
+    answer_cache.pop(file_id, None)
+    results_payloads.pop(file_id, None)
+    cache_versions.pop(file_id, None)
+    file_metadata.pop(file_id, None)
+
+def check_document(file_id: str) -> Optional[Tuple[str, Optional[str]]]:
+    """Return a document's (status, error) from the state database, or None if it is gone.
+
+    Every worker shares the database, so this worker's caches for the document are dropped
+    when another worker has deleted it, it has expired, or its results were rewritten.
+    """
+    with state_db_lock:
+        row = state_db.execute(
+            "SELECT f.status, f.error, f.expiry_ts, r.analysis_time FROM files f "
+            "LEFT JOIN results r ON r.file_id = f.file_id WHERE f.file_id = ?",
+            (file_id,),
+        ).fetchone()
+    if row is None or row[2] <= time.time():
+        forget_document(file_id)
+        return None
+
+    status, error, _, analysis_time = row
+    version = cache_versions.get(file_id)
+    if version is not None and version != (analysis_time or ""):
+        forget_document(file_id)
+    metadata = file_metadata.get(file_id)
+    if metadata is not None:
+        metadata.status, metadata.error = status, error
+    return status, error
+
+def claim_analysis(file_id: str) -> Tuple[bool, Optional[str]]:
+    """Mark a file queued unless a worker is already analyzing it.
+
+    Returns whether this worker took the claim and the file's current status,
+    which is None if the file no longer exists.
+    """
+    now = time.time()
+    with state_db_lock, state_db:
+        claimed = state_db.execute(
+            "UPDATE files SET status = 'queued', error = NULL, status_ts = ? "
+            "WHERE file_id = ? AND (status NOT IN ('queued', 'processing') OR status_ts < ?)",
+            (now, file_id, now - ANALYSIS_STALE_SECONDS),
+        ).rowcount
+        if claimed:
+            return True, "queued"
+        row = state_db.execute("SELECT status FROM files WHERE file_id = ?", (file_id,)).fetchone()
+    return False, row[0] if row else None
+
+def find_analyzed_upload(digest: str) -> Optional[str]:
+    """Return the file_id of a live, analyzed upload with the given SHA-256, if any."""
+    with state_db_lock:
+        row = state_db.execute(
+            "SELECT file_id FROM files WHERE sha256 = ? AND status = 'analyzed' AND expiry_ts > ? "
+            "ORDER BY expiry_ts DESC LIMIT 1",
+            (digest, time.time()),
+        ).fetchone()
+    return row[0] if row else None
+
 def find_file_by_id(file_id: str) -> Optional[str]:
     """Find file path by file_id."""
-    if file_id in file_metadata:
-        return file_metadata[file_id]["file_path"]
-    return None
+    metadata = get_file_meta(file_id)
+    return metadata.file_path if metadata else None
+
+def persist_file(file_id: str, expiry_ts: float):
+    """Write an uploaded file's metadata row."""
+    metadata = file_metadata[file_id]
+    with state_db_lock, state_db:
+        state_db.execute(
+            "INSERT OR REPLACE INTO files (file_id, filename, path, status, upload_ts, expiry_ts, sha256, error, status_ts) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (file_id, metadata.filename, metadata.file_path, metadata.status,
+             metadata.upload_time, expiry_ts, metadata.sha256, metadata.error, time.time()),
+        )
 
-def save_results(file_id: str, results: Dict[str, Any]):
-    """Save analysis results to disk and memory."""
+def set_file_status(file_id: str, status: str, error: Optional[str] = None):
+    """Update a file's processing status and failure detail in memory and in the state database."""
+    metadata = file_metadata.get(file_id)
+    if metadata is not None:
+        metadata.status, metadata.error = status, error
+    # Updates nothing if the file expired and was deleted while a background analysis was running
+    with state_db_lock, state_db:
+        state_db.execute("UPDATE files SET status = ?, error = ?, status_ts = ? WHERE file_id = ?",
+                         (status, error, time.time(), file_id))
+
+def restore_state():
+    """Reload file metadata and pending deletions written by a previous process."""
+    with state_db_lock:
+        rows = state_db.execute(
+            "SELECT file_id, filename, path, status, upload_ts, expiry_ts, sha256, error FROM files"
+        ).fetchall()
+    for file_id, filename, path, status, upload_ts, expiry_ts, digest, error in rows:
+        file_metadata[file_id] = FileMeta(filename, path, upload_ts, status, digest, error)
+        heapq.heappush(expiry_heap, (expiry_ts, file_id, path))
+
+def get_clause_columns(file_id: str, results: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """Return parallel lists of clause ids, texts and lowercase token sets for a document."""
+    columns = clause_columns.get(file_id)
+    if columns is None:
+        clauses = results["clauses"]
+        texts = [clause["original_text"] for clause in clauses]
+        columns = {
+            "ids": [clause["clause_id"] for clause in clauses],
+            "texts": texts,
+            "tokens": [frozenset(text.lower().split()) for text in texts],
+        }
+        clause_columns[file_id] = columns
+    return columns
+
+def embeddings_path(file_id: str) -> str:
+    """Path of the sidecar .npy file holding a document's clause embeddings."""
+    return os.path.join(RESULTS_DIR, f"{file_id}_emb.npy")
+
+async def save_results(file_id: str, results: Dict[str, Any], embeddings: Optional[np.ndarray] = None):
+    """Save analysis results to memory, then to disk without blocking the event loop."""
     # Save to memory
     documents[file_id] = results
-    
-    # Save to disk
-    results_file = os.path.join(RESULTS_DIR, f"{file_id}_results.json")
-    with open(results_file, "w") as f:
-        json.dump(results, f, indent=2)
+    cache_versions[file_id] = results["analysis_time"]
+    clause_columns.pop(file_id, None)
+    chat_indices.pop(file_id, None)
+    chat_embeddings.pop(file_id, None)
+    answer_cache.pop(file_id, None)
+    results_payloads.pop(file_id, None)
+
+    await asyncio.to_thread(write_results, file_id, results, embeddings)
+    # A chat request may have built an index from the previous sidecar while it was being replaced
+    chat_indices.pop(file_id, None)
+    chat_embeddings.pop(file_id, None)
+
+def write_results(file_id: str, results: Dict[str, Any], embeddings: Optional[np.ndarray] = None):
+    """Write analysis results to the state database.
+
+    Clause embeddings are not stored in the database; they are written to a
+    float16 sidecar .npy file in RESULTS_DIR.
+    """
+    clause_rows = [
+        (file_id, i, clause["clause_id"],
+         zlib.compress(clause["original_text"].encode("utf-8"), CLAUSE_TEXT_COMPRESSION_LEVEL),
+         clause["summary"], clause["risk_level"], clause["word_count"])
+        for i, clause in enumerate(results["clauses"])
+    ]
+
+    # Save to disk in a single transaction
+    with state_db_lock, state_db:
+        state_db.execute(
+            "INSERT OR REPLACE INTO results (file_id, filename, risk_summary, total_clauses, status, analysis_time) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (file_id, results["filename"], json.dumps(results["risk_summary"]), results["total_clauses"],
+             results["status"], results.get("analysis_time", "")),
+        )
+        state_db.execute("DELETE FROM clauses WHERE file_id = ?", (file_id,))
+        state_db.executemany(
+            "INSERT INTO clauses (file_id, idx, clause_id, text, summary, risk, word_count) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            clause_rows,
+        )
+
+    if embeddings is not None and len(embeddings):
+        np.save(embeddings_path(file_id), np.asarray(embeddings, dtype=np.float16))
+
+def copy_results(source_id: str, file_id: str, filename: str) -> bool:
+    """Copy a document's stored analysis to another file_id; False if the source has no results."""
+    with state_db_lock, state_db:
+        copied = state_db.execute(
+            "INSERT OR REPLACE INTO results (file_id, filename, risk_summary, total_clauses, status, analysis_time) "
+            "SELECT ?, ?, risk_summary, total_clauses, status, analysis_time FROM results WHERE file_id = ?",
+            (file_id, filename, source_id),
+        ).rowcount
+        if not copied:
+            return False
+        state_db.execute("DELETE FROM clauses WHERE file_id = ?", (file_id,))
+        state_db.execute(
+            "INSERT INTO clauses (file_id, idx, clause_id, text, summary, risk, word_count) "
+            "SELECT ?, idx, clause_id, text, summary, risk, word_count FROM clauses WHERE file_id = ?",
+            (file_id, source_id),
+        )
+
+    # A copy rather than a hard link, since re-analysis rewrites the sidecar in place
+    try:
+        shutil.copyfile(embeddings_path(source_id), embeddings_path(file_id))
+    except FileNotFoundError:
+        pass
+    return True
+
+def load_embeddings(file_id: str) -> Optional[np.ndarray]:
+    """Memory-map a document's clause embeddings (one row per clause), if saved."""
+    try:
+        return np.load(embeddings_path(file_id), mmap_mode="r")
+    except FileNotFoundError:
+        return None
+
+def build_chat_index(file_id: str):
+    """Build a FAISS inner-product index from a document's embedding sidecar, if saved."""
+    embeddings = load_embeddings(file_id)
+    if embeddings is None:
+        return None
+    vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    index = faiss.IndexFlatIP(vectors.shape[1])
+    index.add(vectors)
+    return index
+
+def load_chat_embeddings(file_id: str) -> Optional[np.ndarray]:
+    """Read a document's float16 embedding sidecar into a float32 matrix for scoring."""
+    embeddings = load_embeddings(file_id)
+    return None if embeddings is None else embeddings.astype(np.float32)
+
+async def get_chat_embeddings(file_id: str) -> Optional[np.ndarray]:
+    """Return the cached float32 clause embeddings for a document, upcasting the sidecar once."""
+    embeddings = chat_embeddings.get(file_id)
+    if embeddings is None:
+        embeddings = await asyncio.to_thread(load_chat_embeddings, file_id)
+        if embeddings is not None:
+            chat_embeddings[file_id] = embeddings
+    return embeddings
+
+async def get_chat_index(file_id: str):
+    """Return the cached FAISS index for a document, building it off the event loop on first use."""
+    # cachetools caches are not thread-safe, so the cache is only read and written on the event loop
+    index = chat_indices.get(file_id)
+    if index is None and faiss is not None:
+        index = await asyncio.to_thread(build_chat_index, file_id)
+        if index is not None:
+            chat_indices[file_id] = index
+    return index
+
+def encode_questions(questions: List[str]) -> np.ndarray:
+    """Embed chat questions as normalized float32 rows."""
+    return np.asarray(embedder.encode(questions, convert_to_numpy=True, normalize_embeddings=True,
+                                      show_progress_bar=False), dtype=np.float32)
+
+def lookup_cached_answer(file_id: str, question_embedding: np.ndarray) -> Optional[Dict[str, Any]]:
+    """Return the cached response for a near-identical earlier question on this document."""
+    entries = answer_cache.get(file_id)
+    if not entries:
+        return None
+
+    now = time.monotonic()
+    entries[:] = [entry for entry in entries if now - entry["time"] < ANSWER_CACHE_TTL_SECONDS]
+    if not entries:
+        return None
+
+    scores = np.stack([entry["embedding"] for entry in entries]) @ question_embedding[0]
+    best = int(np.argmax(scores))
+    if scores[best] < ANSWER_CACHE_SIMILARITY:
+        return None
+
+    # Keep the list in least-recently-used order
+    entry = entries.pop(best)
+    entries.append(entry)
+    return entry["response"]
+
+def cache_answer(file_id: str, question_embedding: np.ndarray, response: Dict[str, Any]):
+    """Remember a chat response for this document, evicting the least recently used entry."""
+    entries = answer_cache.setdefault(file_id, [])
+    entries.append({"embedding": question_embedding[0], "response": response, "time": time.monotonic()})
+    if len(entries) > ANSWER_CACHE_MAX_ENTRIES:
+        entries.pop(0)
 
 def load_results(file_id: str) -> Optional[Dict[str, Any]]:
-    """Load analysis results from memory or disk."""
-    if file_id in documents:
-        return documents[file_id]
+    """Load analysis results from memory or the state database."""
+    cached = documents.get(file_id)
+    if cached is not None:
+        return cached
     
     # Try to load from disk
-    results_file = os.path.join(RESULTS_DIR, f"{file_id}_results.json")
-    if os.path.exists(results_file):
-        with open(results_file, "r") as f:
-            results = json.load(f)
-            documents[file_id] = results
-            return results
-    
-    return None
+    with state_db_lock:
+        row = state_db.execute(
+            "SELECT filename, risk_summary, total_clauses, status, analysis_time FROM results WHERE file_id = ?",
+            (file_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        clause_rows = state_db.execute(
+            "SELECT clause_id, text, summary, risk, word_count FROM clauses WHERE file_id = ? ORDER BY idx",
+            (file_id,),
+        ).fetchall()
 
-async def delete_file_later(file_path: str, file_id: str, delay: int = 86400):
-    """Background task to delete file after specified delay (24 hours default)."""
-    print(f"Scheduling deletion of {file_path} and file_id {file_id} in {delay} seconds.")
-    await asyncio.sleep(delay)
-    
+    filename, risk_summary, total_clauses, status, analysis_time = row
+    results = {
+        "file_id": file_id,
+        "filename": filename,
+        "clauses": [
+            {
+                "clause_id": clause_id,
+                "original_text": zlib.decompress(text).decode("utf-8"),
+                "summary": summary,
+                "risk_level": risk,
+                "word_count": word_count
+            }
+            for clause_id, text, summary, risk, word_count in clause_rows
+        ],
+        "risk_summary": json.loads(risk_summary),
+        "total_clauses": total_clauses,
+        "status": status,
+        "analysis_time": analysis_time
+    }
+    documents[file_id] = results
+    cache_versions[file_id] = analysis_time
+    return results
+
+async def save_upload(file: UploadFile, file_path: str) -> str:
+    """Stream an upload to disk in fixed-size chunks and return the SHA-256 of its contents."""
+    sha256 = hashlib.sha256()
+    if aiofiles is not None:
+        async with aiofiles.open(file_path, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                sha256.update(chunk)
+                await out.write(chunk)
+    else:
+        with open(file_path, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                sha256.update(chunk)
+                out.write(chunk)
+    return sha256.hexdigest()
+
+def delete_document(file_path: str, file_id: str):
+    """Delete an uploaded file, its results and every in-memory entry for it."""
     # Delete file
-    if os.path.exists(file_path):
+    try:
         os.remove(file_path)
+    except FileNotFoundError:
+        pass
     print(f"Deleted file: {file_path}")
     
-    # Delete results file
-    results_file = os.path.join(RESULTS_DIR, f"{file_id}_results.json")
-    if os.path.exists(results_file):
-        os.remove(results_file)
-    print(f"Deleted results: {results_file}")
+    # Delete stored metadata and results
+    with state_db_lock, state_db:
+        state_db.execute("DELETE FROM clauses WHERE file_id = ?", (file_id,))
+        state_db.execute("DELETE FROM results WHERE file_id = ?", (file_id,))
+        state_db.execute("DELETE FROM files WHERE file_id = ?", (file_id,))
+    print(f"Deleted results for {file_id}")
+
+    try:
+        os.remove(embeddings_path(file_id))
+    except FileNotFoundError:
+        pass
     
     # Remove from memory
-    if file_id in documents:
-        del documents[file_id]
+    forget_document(file_id)
     print(f"Removed document {file_id} from memory")
-    
-    if file_id in file_metadata:
-        del file_metadata[file_id]
-    print(f"Removed metadata for {file_id}")
 
-async def cleanup_expired_files():
-    """Background task to clean up expired files periodically."""
+def schedule_deletion(file_id: str, file_path: str, delay: float = AUTO_DELETE_HOURS * 3600) -> float:
+    """Queue a document for deletion once the delay has passed and return its expiry time."""
+    expiry_ts = time.time() + delay
+    heapq.heappush(expiry_heap, (expiry_ts, file_id, file_path))
+    if expiry_wakeup is not None:
+        expiry_wakeup.set()
+    return expiry_ts
+
+async def reap_expired_files():
+    """Single background task that deletes documents as their expiry time comes up."""
     while True:
         try:
-            now = datetime.utcnow()
-            expired_files = []
-            
-            # Check file metadata for expired files
-            for file_id, metadata in list(file_metadata.items()):
-                upload_time = datetime.fromisoformat(metadata.get("upload_time", now.isoformat()))
-                if now - upload_time > timedelta(hours=AUTO_DELETE_HOURS):
-                    expired_files.append(file_id)
-            
-            # Clean up expired files
-            for file_id in expired_files:
-                await delete_file_later("", file_id, 0)  # Immediate deletion
-            
-            if expired_files:
-                print(f"🧹 Cleaned up {len(expired_files)} expired files")
-            
+            now = time.time()
+            expired = 0
+            while expiry_heap and expiry_heap[0][0] <= now:
+                _, file_id, file_path = heapq.heappop(expiry_heap)
+                delete_document(file_path, file_id)
+                expired += 1
+
+            if expired:
+                print(f"🧹 Cleaned up {expired} expired files")
+
         except Exception as e:
             print(f"❌ Error in cleanup task: {e}")
-        
-        # Run cleanup every hour
-        await asyncio.sleep(3600)
+
+        # Sleep until the next expiry, or until a new upload is scheduled
+        timeout = max(0.0, expiry_heap[0][0] - time.time()) if expiry_heap else None
+        expiry_wakeup.clear()
+        try:
+            await asyncio.wait_for(expiry_wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
 
 @app.on_event("startup")
 async def startup_event():
     """Start background cleanup task on startup."""
-    asyncio.create_task(cleanup_expired_files())
+    global expiry_wakeup
+    expiry_wakeup = asyncio.Event()
+    restore_state()
+    asyncio.create_task(reap_expired_files())
     print("🚀 Auto-delete cleanup task started")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the state database."""
+    with state_db_lock:
+        state_db.close()
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -340,37 +996,49 @@ async def health_check():
     }
 
 @app.post("/api/upload")
-async def upload_document(file: UploadFile = File(...), background_tasks: BackgroundTasks = None):
+async def upload_document(file: UploadFile = File(...)):
     """
     Upload a legal document (PDF/DOCX) and store it temporarily.
     Analysis is triggered by a separate /analyze endpoint.
     """
     try:
         # Validate file type
-        if file.content_type not in [
-            "application/pdf",
-            "application/msword",
-            "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        ]:
+        expected_type = ALLOWED_CONTENT_TYPES.get(file.content_type)
+        if expected_type is None:
             raise HTTPException(status_code=400, detail="Unsupported file type. Only PDF, DOC, DOCX are allowed.")
 
-        file_id = str(uuid.uuid4())
+        # Check the magic bytes so mislabeled files are rejected before any parsing
+        header = await file.read(8)
+        await file.seek(0)
+        if sniff_file_type(header) != expected_type:
+            raise HTTPException(status_code=400, detail="File contents do not match the declared file type.")
+
+        file_id = secrets.token_hex(16)
         file_path = os.path.join(UPLOAD_DIR, f"{file_id}_{file.filename}")
         
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
+        digest = await save_upload(file, file_path)
+
         # Store file metadata
-        file_metadata[file_id] = {
-            "filename": file.filename,
-            "file_path": file_path,
-            "upload_time": datetime.now().isoformat(),
-            "status": "uploaded"
-        }
+        file_metadata[file_id] = FileMeta(
+            filename=file.filename,
+            file_path=file_path,
+            upload_time=datetime.now().isoformat(),
+            status="uploaded",
+            sha256=digest,
+            error=None
+        )
+        existing_id = find_analyzed_upload(digest)
 
         # Schedule file for deletion after 24 hours
-        if background_tasks:
-            background_tasks.add_task(delete_file_later, file_path, file_id, delay=86400)
+        expiry_ts = schedule_deletion(file_id, file_path)
+        persist_file(file_id, expiry_ts)
+
+        # Identical contents already analyzed: the upload still gets its own file_id, so its expiry and
+        # deletion stay independent of the earlier one, but it starts with a copy of that analysis
+        if existing_id is not None:
+            if await asyncio.to_thread(copy_results, existing_id, file_id, file.filename):
+                set_file_status(file_id, "analyzed")
+                return {"file_id": file_id, "filename": file.filename, "message": "Document already analyzed. Results are ready."}
         
         return {"file_id": file_id, "filename": file.filename, "message": "Document uploaded successfully. Ready for analysis."}
     
@@ -379,24 +1047,50 @@ async def upload_document(file: UploadFile = File(...), background_tasks: Backgr
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error uploading document: {str(e)}")
 
-@app.post("/api/analyze/{file_id}")
+@app.post("/api/analyze/{file_id}", status_code=202)
 async def analyze(file_id: str):
     """
-    Trigger the analysis pipeline for an uploaded document.
-    Uses the existing summarize_clauses.py functionality.
+    Queue the analysis pipeline for an uploaded document and return immediately.
+    Poll /api/results/{file_id} until the results are ready.
     """
-    if file_id not in file_metadata:
+    state = check_document(file_id)
+    metadata = get_file_meta(file_id) if state is not None else None
+    if metadata is None:
         raise HTTPException(status_code=404, detail="File not found. Please upload it first.")
     
-    file_info = file_metadata[file_id]
-    file_path = file_info["file_path"]
+    file_path = metadata.file_path
     
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="Uploaded file not found on server.")
 
+    if state[0] == "analyzed":
+        return JSONResponse(status_code=200, content={"file_id": file_id, "status": "analyzed",
+                                                      "message": "Document already analyzed. Results are ready."})
+
+    # The claim is taken in the database, so only one worker runs the analysis
+    claimed, status = claim_analysis(file_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="File not found. Please upload it first.")
+    if not claimed:
+        return {"file_id": file_id, "status": status, "message": "Analysis already in progress"}
+
+    metadata.status, metadata.error = "queued", None
+    task = asyncio.create_task(run_analysis(file_id))
+    analysis_tasks.add(task)
+    task.add_done_callback(analysis_tasks.discard)
+
+    return {"file_id": file_id, "status": "queued", "message": "Analysis started. Poll the results endpoint for progress."}
+
+async def run_analysis(file_id: str):
+    """Run the analysis pipeline for an uploaded document in the background."""
+    file_info = get_file_meta(file_id)
+    if file_info is None:
+        return
+    file_path = file_info.file_path
+
     try:
         # Update status
-        file_metadata[file_id]["status"] = "processing"
+        set_file_status(file_id, "processing")
         
         # Extract text
         text = extract_text(file_path)
@@ -412,14 +1106,16 @@ async def analyze(file_id: str):
         processed_clauses = []
         risk_summary = {"High": 0, "Medium": 0, "Low": 0}
         
-        # Generate embeddings for all clauses first
-        clause_embeddings = build_embeddings(clauses)
+        # Run each model over the whole document at once, then assemble per-clause results.
+        # The three passes are independent, so run them concurrently off the event loop.
+        clause_embeddings, summaries, risks = await asyncio.gather(
+            embed_clauses(clauses),
+            asyncio.to_thread(summarize_clauses_batch, clauses),
+            asyncio.to_thread(classify_risks_batch, clauses),
+        )
 
-        for i, clause_text in enumerate(clauses):
+        for i, (clause_text, summary, risk) in enumerate(zip(clauses, summaries, risks)):
             clause_id = f"clause_{i+1}"
-            summary = summarize_clause(clause_text)
-            risk = classify_risk(clause_text)
-            
             risk_summary[risk] += 1
             
             clause_data = {
@@ -427,15 +1123,14 @@ async def analyze(file_id: str):
                 "original_text": clause_text,
                 "summary": summary,
                 "risk_level": risk,
-                "word_count": len(clause_text.split()),
-                "embedding": clause_embeddings[i] if clause_embeddings and i < len(clause_embeddings) else None
+                "word_count": count_words(clause_text)
             }
             processed_clauses.append(clause_data)
         
         # Prepare results
         results = {
             "file_id": file_id,
-            "filename": file_info["filename"],
+            "filename": file_info.filename,
             "clauses": processed_clauses,
             "risk_summary": risk_summary,
             "total_clauses": len(processed_clauses),
@@ -444,52 +1139,65 @@ async def analyze(file_id: str):
         }
         
         # Save results
-        save_results(file_id, results)
+        await save_results(file_id, results, clause_embeddings)
         
         # Update file status
-        file_metadata[file_id]["status"] = "analyzed"
-        
-        return {"file_id": file_id, "message": "Document analyzed successfully", "clauses_count": len(processed_clauses)}
+        set_file_status(file_id, "analyzed")
+        logger.info(f"Analyzed {file_id}: {len(processed_clauses)} clauses")
     
-    except HTTPException:
-        file_metadata[file_id]["status"] = "failed"
-        raise
+    except HTTPException as e:
+        set_file_status(file_id, "failed", e.detail)
     except Exception as e:
-        file_metadata[file_id]["status"] = "failed"
-        raise HTTPException(status_code=500, detail=f"Error analyzing document: {str(e)}")
+        logger.exception(f"Error analyzing {file_id}: {e}")
+        set_file_status(file_id, "failed", f"Error analyzing document: {str(e)}")
 
 @app.get("/api/results/{file_id}")
-async def get_results(file_id: str):
+async def get_results(file_id: str, request: Request):
     """
     Retrieve full analysis results for a specific document.
     """
-    results = load_results(file_id)
-    if not results:
+    # The analysis may have run, failed or been deleted in another worker, so check the database first
+    state = check_document(file_id)
+    if state is None:
         raise HTTPException(status_code=404, detail="No results found. Please analyze the document first.")
-    
-    # Return clauses without embeddings for lighter payload
-    clauses_without_embeddings = []
-    for clause in results["clauses"]:
-        clause_copy = clause.copy()
-        clause_copy.pop("embedding", None)  # Remove embedding before sending to frontend
-        clauses_without_embeddings.append(clause_copy)
 
-    return {
-        "file_id": file_id,
-        "filename": results["filename"],
-        "clauses": clauses_without_embeddings,
-        "risk_summary": results["risk_summary"],
-        "total_clauses": results["total_clauses"],
-        "status": results["status"],
-        "analysis_time": results.get("analysis_time", "")
-    }
+    cached = results_payloads.get(file_id)
+    if cached is None:
+        results = load_results(file_id)
+        if not results:
+            status, error = state
+            if status in ("queued", "processing"):
+                return JSONResponse(status_code=202, content={"file_id": file_id, "status": status})
+            if status == "failed":
+                raise HTTPException(status_code=422, detail=error or "Analysis failed.")
+            raise HTTPException(status_code=404, detail="No results found. Please analyze the document first.")
+
+        # Embeddings live in the .npy sidecar, so stored clauses can be returned as-is
+        body = {
+            "file_id": file_id,
+            "filename": results["filename"],
+            "clauses": results["clauses"],
+            "risk_summary": results["risk_summary"],
+            "total_clauses": results["total_clauses"],
+            "status": results["status"],
+            "analysis_time": results.get("analysis_time", "")
+        }
+        payload = orjson.dumps(body) if orjson is not None else json.dumps(body, separators=(",", ":")).encode("utf-8")
+        etag = f'W/"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"'
+        cached = results_payloads[file_id] = (payload, etag)
+
+    payload, etag = cached
+    # Clients polling for results get a bodiless 304 until the results change
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=payload, media_type="application/json", headers={"ETag": etag})
 
 @app.post("/api/chat/{file_id}")
 async def chat_with_doc(file_id: str, query: ChatQuery):
     """
     Answer a question about a specific document using semantic search and AI.
     """
-    results = load_results(file_id)
+    results = load_results(file_id) if check_document(file_id) is not None else None
     if not results:
         raise HTTPException(status_code=404, detail="No analysis available. Please analyze the document first.")
     
@@ -506,23 +1214,30 @@ async def chat_with_doc(file_id: str, query: ChatQuery):
             }
 
         # Prepare clause data for semantic search
-        clause_texts = [clause["original_text"] for clause in clauses]
-        clause_ids = [clause["clause_id"] for clause in clauses]
+        columns = get_clause_columns(file_id, results)
+        clause_texts = columns["texts"]
+        clause_ids = columns["ids"]
 
         # Try semantic search but guard it with a timeout and run blocking work in a thread
         relevant_clauses = []
         relevant_ids = []
+        question_embedding = None
+        # Only answers grounded in above-threshold semantic matches are cached for similar questions
+        semantic_match = False
         if embedder is not None:
-            def _semantic_search_sync(question, clause_texts, clause_ids):
+            def _semantic_search_sync(question_embedding, index, clause_embeddings, clause_texts, clause_ids):
                 try:
-                    question_embedding = embedder.encode([question], convert_to_tensor=True)
-                    clause_embeddings = embedder.encode(clause_texts, convert_to_tensor=True)
-
-                    similarities = util.cos_sim(question_embedding, clause_embeddings)[0]
                     top_k = min(3, len(clause_texts))
-                    topk = similarities.topk(k=top_k)
-                    top_indices = topk.indices.tolist()
-                    top_scores = topk.values.tolist()
+                    if index is not None and index.ntotal == len(clause_texts) and index.d == question_embedding.shape[1]:
+                        # Clause vectors were embedded at analyze time; only the question is encoded here
+                        scores, indices = index.search(question_embedding, top_k)
+                        top_indices = indices[0].tolist()
+                        top_scores = scores[0].tolist()
+                    else:
+                        # Without FAISS, score the cached float32 embeddings; re-encode only if they are missing or stale
+                        if clause_embeddings is None or clause_embeddings.shape != (len(clause_texts), question_embedding.shape[1]):
+                            clause_embeddings = build_embeddings(clause_texts)
+                        top_indices, top_scores = semantic_search(question_embedding, clause_embeddings, top_k)
 
                     found_ids = []
                     for idx, score in zip(top_indices, top_scores):
@@ -535,13 +1250,23 @@ async def chat_with_doc(file_id: str, query: ChatQuery):
                     return []
 
             try:
-                # Limit semantic search to 10 seconds to avoid long blocking operations
-                found_ids = await asyncio.wait_for(
-                    asyncio.to_thread(_semantic_search_sync, question, clause_texts, clause_ids),
-                    timeout=10.0
-                )
+                # Limit embedding and semantic search to 10 seconds each to avoid long blocking operations
+                question_embedding = await asyncio.wait_for(embed_question(question), timeout=10.0)
+                cached_response = lookup_cached_answer(file_id, question_embedding)
+                if cached_response is not None:
+                    logger.info("chat_with_doc: answered from semantic answer cache")
+                    return cached_response
+
+                async def _semantic_search():
+                    index = await get_chat_index(file_id)
+                    clause_embeddings = None if index is not None else await get_chat_embeddings(file_id)
+                    return await asyncio.to_thread(_semantic_search_sync, question_embedding, index, clause_embeddings,
+                                                   clause_texts, clause_ids)
+
+                found_ids = await asyncio.wait_for(_semantic_search(), timeout=10.0)
                 if found_ids:
                     logger.info("chat_with_doc: semantic search returned results")
+                    semantic_match = True
                     relevant_ids = found_ids
                     # Map ids to full clause objects
                     relevant_clauses = [c for c in clauses if c.get("clause_id") in relevant_ids]
@@ -554,13 +1279,10 @@ async def chat_with_doc(file_id: str, query: ChatQuery):
         
     # If semantic search did not populate relevant_clauses, run simple keyword overlap
         if not relevant_clauses:
-            question_lower = question.lower()
+            question_words = set(question.lower().split())
             relevant_clauses = []
             relevant_ids = []
-            for i, clause_text in enumerate(clause_texts):
-                clause_lower = clause_text.lower()
-                question_words = set(question_lower.split())
-                clause_words = set(clause_lower.split())
+            for i, clause_words in enumerate(columns["tokens"]):
                 common_words = question_words.intersection(clause_words)
                 if len(common_words) >= 2:
                     relevant_clauses.append(clauses[i])
@@ -577,7 +1299,10 @@ async def chat_with_doc(file_id: str, query: ChatQuery):
             try:
                 gemini_answer = generate_answer_gemini(question, relevant_clauses)
                 if gemini_answer:
-                    return {"answer": gemini_answer, "relevant_clauses": [c.get("clause_id") for c in relevant_clauses]}
+                    response = {"answer": gemini_answer, "relevant_clauses": [c.get("clause_id") for c in relevant_clauses]}
+                    if semantic_match:
+                        cache_answer(file_id, question_embedding, response)
+                    return response
             except Exception:
                 logger.exception("Gemini adapter failed; falling back to local summarization")
 
@@ -590,10 +1315,13 @@ async def chat_with_doc(file_id: str, query: ChatQuery):
 
         answer = f"Based on the document analysis:\n\n" + "\n\n".join(answer_parts)
 
-        return {
+        response = {
             "answer": answer,
             "relevant_clauses": [c.get("clause_id") for c in relevant_clauses[:3]]
         }
+        if semantic_match:
+            cache_answer(file_id, question_embedding, response)
+        return response
         
     except Exception as e:
         print(f"Error in chat endpoint: {e}")
@@ -601,9 +1329,9 @@ async def chat_with_doc(file_id: str, query: ChatQuery):
 
 # Legacy endpoints for backward compatibility
 @app.get("/clauses/{doc_id}")
-async def get_clauses_legacy(doc_id: str):
+async def get_clauses_legacy(doc_id: str, request: Request):
     """Legacy endpoint - redirects to results."""
-    return await get_results(doc_id)
+    return await get_results(doc_id, request)
 
 @app.post("/ask")
 async def ask_question_legacy(request: QuestionRequest):
@@ -615,4 +1343,12 @@ if __name__ == "__main__":
     print("Starting Legal Document Analysis API...")
     print("API Documentation: http://localhost:9000/docs")
     print("Auto-delete enabled for privacy (24 hours)")
-    uvicorn.run(app, host="0.0.0.0", port=9000)
\ No newline at end of file
+    workers = max(1, int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))))
+    if workers == 1:
+        # Serve this module's app directly; an import string would import the module a second time
+        uvicorn.run(app, host="0.0.0.0", port=9000)
+    else:
+        # Worker processes import the app by name and size their thread pools from WEB_CONCURRENCY
+        os.environ["WEB_CONCURRENCY"] = str(workers)
+        app_path = f"{__spec__.name}:app" if __spec__ is not None else "main:app"
+        uvicorn.run(app_path, host="0.0.0.0", port=9000, workers=workers)
\ No newline at end of file
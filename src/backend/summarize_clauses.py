@@ -150,6 +150,16 @@ class TextCleaner:
         r'\bshould\b', r'\bmay\b', r'\bcondition\b'
     ]
     
+    # Key entity patterns
+    ENTITY_PATTERNS = {
+        'money': r'\$[\d,]+(?:\.\d{2})?',
+        'percentage': r'\d+(?:\.\d+)?%',
+        'timeframe': r'\b\d+\s*(?:days?|weeks?|months?|years?|hours?)\b',
+        'dates': r'\b\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}\b',
+        'late_fees': r'late\s+fee\s+of\s+[\$\d%]+',
+        'penalties': r'penalty\s+of\s+[\$\d%]+',
+    }
+    
     def __init__(self):
         self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) 
                                 for pattern in self.BOILERPLATE_PATTERNS]
@@ -163,6 +173,10 @@ class TextCleaner:
         }
         self.conditional_compiled = [re.compile(pattern, re.IGNORECASE) 
                                    for pattern in self.CONDITIONAL_PATTERNS]
+        self.entity_compiled = {
+            entity_type: re.compile(pattern, re.IGNORECASE)
+            for entity_type, pattern in self.ENTITY_PATTERNS.items()
+        }
     
     def is_boilerplate(self, text: str) -> bool:
         """Enhanced boilerplate detection with protection for numeric clauses."""
@@ -302,18 +316,8 @@ class TextCleaner:
         """Extract key entities with improved patterns."""
         entities = []
         
-        # Enhanced patterns
-        patterns = {
-            'money': r'\$[\d,]+(?:\.\d{2})?',
-            'percentage': r'\d+(?:\.\d+)?%',
-            'timeframe': r'\b\d+\s*(?:days?|weeks?|months?|years?|hours?)\b',
-            'dates': r'\b\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}\b',
-            'late_fees': r'late\s+fee\s+of\s+[\$\d%]+',
-            'penalties': r'penalty\s+of\s+[\$\d%]+',
-        }
-        
-        for entity_type, pattern in patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for entity_type, pattern in self.entity_compiled.items():
+            matches = pattern.findall(text)
             for match in matches:
                 entities.append(f"{entity_type}: {match}")
         
@@ -1,6 +1,6 @@
 import re
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 import pypdfium2 as pdfium
 import docx
 import openai
@@ -12,6 +12,14 @@ load_dotenv()
 # Set OpenAI API key from environment variable
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
+# Patterns for common clause headers like "1.", "Article 1", "Section 1", etc.
+CLAUSE_HEADER_PATTERNS = [
+    r'(?:\n|\r\n)(?:Article|Section|Clause)\s+\d+[\.\s]',
+    r'(?:\n|\r\n)\d+\.(?:\d+)?[\.\s]',  # Matches "1.", "1.1.", etc.
+    r'(?:\n|\r\n)(?:[A-Z])\.[\s]'  # Matches "A.", "B.", etc.
+]
+_CLAUSE_HEADER_RE = re.compile('|'.join(CLAUSE_HEADER_PATTERNS))
+
 def extract_text(file_path: str) -> str:
     """
     Extract text from PDF or DOCX files.
@@ -31,16 +39,27 @@ def extract_text(file_path: str) -> str:
     else:
         raise ValueError(f"Unsupported file format: {file_extension}")
 
-def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from PDF file using pypdfium2."""
-    text = ""
+def iter_pdf_pages(file_path: str) -> Iterator[str]:
+    """Yield the text of each PDF page in order using pypdfium2."""
+    pdf = pdfium.PdfDocument(file_path)
     try:
-        pdf = pdfium.PdfDocument(file_path)
         for page_number in range(len(pdf)):
             page = pdf[page_number]
             text_page = page.get_textpage()
-            text += text_page.get_text() + "\n"
-        return text
+            try:
+                yield text_page.get_text_range()
+            finally:
+                # Release native handles right away instead of waiting for GC
+                text_page.close()
+                page.close()
+    finally:
+        pdf.close()
+
+def extract_text_from_pdf(file_path: str) -> str:
+    """Extract text from PDF file using pypdfium2."""
+    try:
+        parts = [page_text + "\n" for page_text in iter_pdf_pages(file_path)]
+        return "".join(parts)
     except Exception as e:
         print(f"Error extracting text from PDF: {e}")
         return ""
@@ -49,10 +68,7 @@ def extract_text_from_docx(file_path: str) -> str:
     """Extract text from DOCX file."""
     try:
         doc = docx.Document(file_path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
     except Exception as e:
         print(f"Error extracting text from DOCX: {e}")
         return ""
@@ -70,18 +86,8 @@ def split_clauses(text: str) -> List[str]:
     # Simple heuristic: Split by numbered sections, articles, or clauses
     # This is a basic implementation and might need refinement based on document structure
     
-    # Pattern for common clause headers like "1.", "Article 1", "Section 1", etc.
-    patterns = [
-        r'(?:\n|\r\n)(?:Article|Section|Clause)\s+\d+[\.\s]',
-        r'(?:\n|\r\n)\d+\.(?:\d+)?[\.\s]',  # Matches "1.", "1.1.", etc.
-        r'(?:\n|\r\n)(?:[A-Z])\.[\s]'  # Matches "A.", "B.", etc.
-    ]
-    
-    # Combine patterns
-    combined_pattern = '|'.join(patterns)
-    
-    # Split text using the combined pattern
-    splits = re.split(combined_pattern, text)
+    # Split text using the precompiled header pattern
+    splits = _CLAUSE_HEADER_RE.split(text)
     
     # Clean up splits
     clauses = [clause.strip() for clause in splits if clause.strip()]
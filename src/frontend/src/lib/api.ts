@@ -12,8 +12,8 @@ export interface UploadResponse {
 
 export interface AnalysisResponse {
   file_id: string;
+  status: string;
   message: string;
-  clauses_count: number;
 }
 
 export interface Clause {
@@ -77,8 +77,20 @@ export async function analyzeDocument(fileId: string): Promise<AnalysisResponse>
   return response.json();
 }
 
+// Analysis runs in the background; the results endpoint answers 202 until it has finished
+const RESULTS_POLL_INTERVAL_MS = 1000;
+// Give up after 10 minutes rather than polling forever if the analysis never finishes
+const RESULTS_POLL_MAX_ATTEMPTS = 600;
+
 export async function fetchResults(fileId: string): Promise<ResultsResponse> {
-  const response = await fetch(`${API_BASE_URL}/api/results/${fileId}`);
+  let response = await fetch(`${API_BASE_URL}/api/results/${fileId}`);
+  for (let attempt = 0; response.status === 202; attempt++) {
+    if (attempt >= RESULTS_POLL_MAX_ATTEMPTS) {
+      throw new Error("Analysis is taking too long to finish. Please try again later.");
+    }
+    await new Promise((resolve) => setTimeout(resolve, RESULTS_POLL_INTERVAL_MS));
+    response = await fetch(`${API_BASE_URL}/api/results/${fileId}`);
+  }
   
   if (!response.ok) {
     const errorData = await response.json().catch(() => ({}));